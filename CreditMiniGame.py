@@ -4,8 +4,10 @@ import random
 import math
 
 class CreditScoreGame:
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, on_result=None):
         self.root = tk.Toplevel(parent) if parent else tk.Tk()
+        # Called with a dict summarising the outcome when the game ends
+        self.on_result = on_result
         self.root.title("Credit Score Challenge")
         self.root.geometry("1000x800")
         self.root.resizable(True, True)
@@ -510,6 +512,7 @@ class CreditScoreGame:
         self.next_month_btn.config(state=tk.DISABLED)
         
         final_score = self.calculate_credit_score()
+        self.report_result(won, final_score)
         
         if won:
             title = "🎉 Congratulations!"
@@ -564,6 +567,24 @@ class CreditScoreGame:
                 
         messagebox.showinfo(title, message)
         
+    def report_result(self, won, final_score):
+        if self.on_result is None:
+            return
+        self.on_result({
+            "game": "credit",
+            "won": won,
+            "score": final_score,
+            "target": self.target_score,
+            "months_used": self.current_month - 1,
+            "factors": {
+                "payment_history": self.payment_history,
+                "credit_utilization": self.credit_utilization,
+                "credit_age": self.credit_age,
+                "credit_mix": self.credit_mix,
+                "inquiries": self.inquiries,
+            },
+        })
+        
     def run(self):
         self.root.mainloop()
 
@@ -8,25 +8,64 @@ game.
 Controls & mechanics:
 - Start button opens the simulation loop
 - Slider adjusts the federal funds rate (in percent)
+- Pause / Step and speed buttons (1x to 1000x) control the simulation clock
 - Dashboard shows Inflation (%), Unemployment (%), and GDP (index)
 - Alerts appear when a metric "tanks"
+- Charts along the bottom show the last few minutes of each metric and the rate
 - Exit button in top-right closes the popup
 
 Run: python3 minigame.py
 
-This file is dependency-free (uses stdlib tkinter). The simulation is
+Needs only the standard library (tkinter) plus this repo's
+fed_simulation.py (the model; this class is only its view), timeseries.py
+(chart history) and timing.py (the simulation clock). The simulation is
 intentionally simple / pedagogical rather than an accurate macro model.
 """
 
+import time
 import tkinter as tk
 from tkinter import ttk, font
-import random
-import math
+
+from fed_simulation import FedSimulation, TICK_MS
+from timeseries import RingBuffer
+from timing import SimClock
+
+# Dashboard rows: (metric, title, min label, max label, value format,
+# bar min, bar max, bad_is_high)
+METRICS = (
+	("inflation", "Inflation", "0%", "12%", "{:.2f}%", 0.0, 12.0, True),
+	("unemployment", "Unemployment", "0%", "40%", "{:.2f}%", 0.0, 15.0, True),
+	# GDP bar shows the distance from the 100 baseline, -30..+50 (good higher)
+	("gdp", "GDP Index", "50", "200", "{:.2f}", 70.0, 150.0, False),
+)
+GRADIENT_STEPS = 256
+
+# History charts: (series, title, line color, axis min, axis max, value format)
+CHARTS = (
+	("inflation", "Inflation", "#D9778F", -1.0, 12.0, "{:.1f}%"),
+	("unemployment", "Unemployment", "#6C9BB0", 0.0, 15.0, "{:.1f}%"),
+	("gdp", "GDP", "#5E9E7C", 70.0, 150.0, "{:.0f}"),
+	("rate", "Rate", "#2F3B4A", -1.0, 10.0, "{:.2f}%"),
+)
+HISTORY_TICKS = 1200  # 5 minutes at 250 ms per tick
+CHART_SIZE = (168, 84)
+
+# Simulation speeds offered, and the UI frame the dashboard redraws at
+SPEEDS = (1, 2, 10, 100, 1000)
+FRAME_MS = 33
+# Stepping stops for the frame after this long, so the slider stays live;
+# the steps left over run in later frames, up to MAX_BACKLOG of them
+FRAME_BUDGET = 0.012
+MAX_BACKLOG = 2000
+# How often the achieved speed shown under the speed buttons is measured (s)
+SPEED_WINDOW = 0.5
 
 
 class FedMiniGame:
-	def __init__(self, master):
+	def __init__(self, master, on_result=None):
 		self.master = master
+		# Called with a dict summarising the session when the popup closes
+		self.on_result = on_result
 		master.title("Fed Mini-Game")
 
 		# Root colors and style
@@ -43,8 +82,9 @@ class FedMiniGame:
 		self.popup = tk.Toplevel(master)
 		self.popup.title("Stabilize the Economy")
 		self.popup.configure(bg=self.bg)
-		self.popup.geometry("760x460")
+		self.popup.geometry("760x580")
 		self.popup.resizable(False, False)
+		self.popup.protocol("WM_DELETE_WINDOW", self._exit)
 
 		# Make a rounded-looking panel using a Canvas
 		self.canvas = tk.Canvas(self.popup, bg=self.bg, highlightthickness=0)
@@ -80,24 +120,36 @@ class FedMiniGame:
 		# Placeholder for game content (added after Start)
 		self.controls_window = None
 
-		# Simulation state (defaults)
+		# Simulation state (rate, economy and session stats)
 		self.running = False
-		self.rate = 2.5  # current fed funds rate
-		self.neutral_rate = 2.5
-
-		# Economic variables
-		self.inflation = 2.0  # %
-		self.unemployment = 5.0  # %
-		self.gdp = 100.0  # index (100 baseline)
+		self.sim = FedSimulation()
+		self.result_sent = False
 
 		# Alert widget
 		self.alert_var = tk.StringVar(value="")
 
-		# Tick time (ms)
-		self.tick_ms = 250
+		# Bar colors, good (sage) to bad (pink), looked up instead of parsed per tick
+		self.gradient = [self._interpolate_color(self.sage, self.pastel_pink, i / (GRADIENT_STEPS - 1))
+						 for i in range(GRADIENT_STEPS)]
+		# metric -> its dashboard widgets and what they currently show
+		self.metric_rows = {}
+		# series -> fixed-size history, and its chart's canvas items
+		self.history = {series: RingBuffer(HISTORY_TICKS) for series, *_ in CHARTS}
+		self.charts = {}
+
+		# Tick time (ms): simulation time per step, at 1x
+		self.tick_ms = TICK_MS
+		# Turns wall-clock time x speed into steps; frames run on a fixed grid
+		self.clock = SimClock(self.tick_ms / 1000.0, max_backlog=MAX_BACKLOG)
+		self._next_frame = None
+		self.speed_buttons = {}
+		# Steps run and wall time since the achieved speed was last measured
+		self._speed_steps = 0
+		self._speed_since = None
+		self._speed_text = None
 
 	def _draw_panel(self):
-		w, h = 760, 460
+		w, h = 760, 580
 		r = 18  # corner radius
 		x0, y0, x1, y1 = 12, 12, w - 12, h - 12
 		# Create rounded rectangle manually
@@ -119,7 +171,9 @@ class FedMiniGame:
 		except Exception:
 			pass
 		self._build_controls()
-		self._tick()  # start the simulation loop
+		self.clock.resume()
+		self._next_frame = time.perf_counter()
+		self._frame()  # start the simulation loop
 
 	def _build_controls(self):
 		# Left: slider & instructions
@@ -131,20 +185,41 @@ class FedMiniGame:
 
 		# Interest rate label + slider row (use tk.Label so background can be set)
 		tk.Label(frame_left, text="Interest Rate", font=self.metric_font, background=self.panel_color, foreground="#2F3B4A").pack(anchor="w")
-		self.rate_var = tk.DoubleVar(value=self.rate)
+		self.rate_var = tk.DoubleVar(value=self.sim.rate)
 		slider_row = tk.Frame(frame_left, bg=self.panel_color)
 		slider_row.pack(fill=tk.X, pady=(6, 8))
 		slider = ttk.Scale(slider_row, from_=-1.0, to=10.0, orient=tk.HORIZONTAL,
 			   length=260, variable=self.rate_var, command=self._on_slider)
 		slider.pack(side=tk.LEFT)
 		# numeric display of current rate
-		self.rate_display_label = tk.Label(slider_row, text=f"{self.rate:.2f}%", font=self.body_font, bg=self.panel_color, fg="#333")
+		self.rate_display_label = tk.Label(slider_row, text=f"{self.sim.rate:.2f}%", font=self.body_font, bg=self.panel_color, fg="#333")
 		self.rate_display_label.pack(side=tk.LEFT, padx=(8, 0))
 
 		# short instruction
 		tk.Label(frame_left, text="Adjust the rate to try to keep inflation low\nand unemployment manageable.",
 			   font=self.small_font, background=self.panel_color, justify=tk.LEFT, wraplength=300, foreground="#444").pack()
 
+		# Playback row: pause, single step and speed
+		playback = tk.Frame(frame_left, bg=self.panel_color)
+		playback.pack(anchor="w", pady=(10, 0))
+		self.pause_btn = tk.Button(playback, text="Pause", command=self._toggle_pause,
+								   bg=self.light_blue, fg="#2F3B4A", font=self.small_font,
+								   bd=0, padx=8, pady=4)
+		self.pause_btn.pack(side=tk.LEFT)
+		tk.Button(playback, text="Step", command=self._step_once,
+				  bg=self.light_blue, fg="#2F3B4A", font=self.small_font,
+				  bd=0, padx=8, pady=4).pack(side=tk.LEFT, padx=(4, 10))
+		for speed in SPEEDS:
+			btn = tk.Button(playback, text=f"{speed}x", command=lambda s=speed: self._set_speed(s),
+							fg="#2F3B4A", font=self.small_font, bd=0, padx=4, pady=4)
+			btn.pack(side=tk.LEFT, padx=1)
+			self.speed_buttons[speed] = btn
+		# Achieved speed, which falls short of the chosen one on a slow machine
+		self.speed_label = tk.Label(frame_left, text="", font=self.small_font, bg=self.panel_color,
+									fg="#555", justify=tk.LEFT, wraplength=300)
+		self.speed_label.pack(anchor="w", pady=(4, 0))
+		self._set_speed(self.clock.speed)
+
 		# Right: dashboard
 		frame_right = tk.Frame(self.popup, bg=self.panel_color, width=360)
 		frame_right.configure(padx=12, pady=12)
@@ -153,9 +228,8 @@ class FedMiniGame:
 
 		# Metric rows
 		# Add metrics with readable min/max labels
-		self._create_metric_row(frame_right, "Inflation", "inflation", min_label="0%", max_label="12%")
-		self._create_metric_row(frame_right, "Unemployment", "unemployment", min_label="0%", max_label="40%")
-		self._create_metric_row(frame_right, "GDP Index", "gdp", min_label="50", max_label="200")
+		for metric, title, min_label, max_label, *_ in METRICS:
+			self._create_metric_row(frame_right, title, metric, min_label=min_label, max_label=max_label)
 
 		# Alert area at bottom
 		alert_frame = tk.Frame(self.popup, bg=self.panel_color)
@@ -165,6 +239,22 @@ class FedMiniGame:
 									fg="#7A1F1F")
 		self.alert_label.pack()
 
+		# History charts along the bottom
+		chart_frame = tk.Frame(self.popup, bg=self.panel_color)
+		self.canvas.create_window(380, 505, window=chart_frame)
+		for series, title, color, *_ in CHARTS:
+			self._create_chart(chart_frame, series, title, color)
+
+	def _create_chart(self, parent, series, title, color):
+		w, h = CHART_SIZE
+		chart = tk.Canvas(parent, width=w, height=h, bg="#F4F6F8", highlightthickness=0)
+		chart.pack(side=tk.LEFT, padx=4)
+		chart.create_text(6, 4, anchor="nw", text=title, font=self.small_font, fill="#2F3B4A")
+		value = chart.create_text(w - 6, 4, anchor="ne", text="", font=self.small_font, fill="#555")
+		# One line per chart; each redraw only replaces its coordinates
+		line = chart.create_line(0, 0, 0, 0, fill=color, width=1)
+		self.charts[series] = {"canvas": chart, "line": line, "value": value, "text": None}
+
 	def _create_metric_row(self, parent, label_text, attr_name, min_label=None, max_label=None):
 		row = tk.Frame(parent, bg=self.panel_color)
 		row.pack(fill=tk.X, pady=8)
@@ -177,9 +267,15 @@ class FedMiniGame:
 
 
 		# small bar (wider and centered) - background matches panel (white)
-		bar_canvas = tk.Canvas(row, width=320, height=14, bg=self.panel_color, highlightthickness=0)
+		w, h = 320, 14
+		bar_canvas = tk.Canvas(row, width=w, height=h, bg=self.panel_color, highlightthickness=0)
 		bar_canvas.pack(pady=6, anchor="center")
 		setattr(self, f"{attr_name}_bar", bar_canvas)
+		# Track and fill are created once; ticks only move and recolor the fill
+		bar_canvas.create_rectangle(0, 0, w, h, fill="#F4F6F8", outline="")
+		fill = bar_canvas.create_rectangle(0, 0, 0, h, fill=self.gradient[0], outline="")
+		self.metric_rows[attr_name] = {"label": val, "bar": bar_canvas, "fill": fill,
+									   "width": w, "height": h, "text": None, "shown": None}
 
 		# optional min/max labels under the bar for clarity
 		if min_label is not None or max_label is not None:
@@ -191,95 +287,161 @@ class FedMiniGame:
 			right.pack(side=tk.RIGHT)
 
 	def _on_slider(self, _=None):
-		self.rate = float(self.rate_var.get())
+		self.sim.rate = float(self.rate_var.get())
 		# update numeric display immediately
 		try:
-			self.rate_display_label.configure(text=f"{self.rate:.2f}%")
+			self.rate_display_label.configure(text=f"{self.sim.rate:.2f}%")
 		except Exception:
 			pass
 
-	def _tick(self):
-		if not self.running:
-			return
-
-		# Update based on current rate vs neutral
-		r = self.rate
-		neutral = self.neutral_rate
-		influence = neutral - r  # positive when rate below neutral (stimulative)
-
-		# Inflation: stimulative policy increases inflation slowly
-		# noise adds small randomness
-		self.inflation += (0.03 * -influence) + random.uniform(-0.05, 0.05)
-
-		# Unemployment: stimulative policy lowers unemployment, but with lag
-		self.unemployment += (0.04 * influence) + random.uniform(-0.03, 0.03)
-
-		# GDP: if stimulative (rate low), GDP grows; if restrictive, GDP growth slows
-		gdp_change = (0.12 * -influence) + random.uniform(-0.08, 0.08)
-		# Apply a small decay so GDP doesn't explode
-		self.gdp += gdp_change
-
-		# Clamp sensible ranges
-		self.inflation = max(-1.0, min(20.0, self.inflation))
-		self.unemployment = max(0.0, min(40.0, self.unemployment))
-		self.gdp = max(50.0, min(200.0, self.gdp))
-
-		# Update UI
+	def _toggle_pause(self):
+		if self.clock.paused:
+			self.clock.resume()
+			self.pause_btn.configure(text="Pause")
+		else:
+			self.clock.pause()
+			self.pause_btn.configure(text="Play")
+
+	def _step_once(self):
+		# Stepping implies pausing, so the step is visible
+		if not self.clock.paused:
+			self._toggle_pause()
+		self._run_steps(1)
 		self._update_dashboard()
 
-		# Schedule next tick
-		self.popup.after(self.tick_ms, self._tick)
-
-	def _update_dashboard(self):
-		# Update numeric labels
-		self.inflation_label.configure(text=f"{self.inflation:.2f}%")
-		self.unemployment_label.configure(text=f"{self.unemployment:.2f}%")
-		self.gdp_label.configure(text=f"{self.gdp:.2f}")
-
-		# Update bars (normalized values for visuals)
-		self._draw_bar(self.inflation_bar, self.inflation, 0, 12, bad_is_high=True)
-		self._draw_bar(self.unemployment_bar, self.unemployment, 0, 15, bad_is_high=True)
-		# For GDP: visualize distance from 100 baseline (good higher)
-		self._draw_bar(self.gdp_bar, self.gdp - 100.0, -30, 50, bad_is_high=False)
-
-		# Alerts when things 'tank'
-		alerts = []
-		if self.inflation > 8.0:
-			alerts.append("High inflation — prices rising rapidly!")
-		if self.unemployment > 12.0:
-			alerts.append("Unemployment spike — too many people out of work!")
-		if self.gdp < 90.0:
-			alerts.append("GDP falling — economy shrinking!")
-
-		if alerts:
-			self.alert_var.set(" ⚠ " + "   •   ".join(alerts))
-			self.alert_label.configure(fg="#8B1E1E")
+	def _set_speed(self, speed):
+		self.clock.speed = speed
+		for value, btn in self.speed_buttons.items():
+			btn.configure(bg=self.sage if value == speed else self.panel_color)
+		self._speed_steps = 0
+		self._speed_since = None
+
+	def _show_speed(self, now, steps):
+		# Compare the speed actually achieved with the chosen one, twice a second
+		if self.clock.paused or self._speed_since is None:
+			self._speed_steps, self._speed_since = 0, now
+			text = "Paused" if self.clock.paused else self._speed_text or ""
 		else:
-			self.alert_var.set("")
-
-	def _draw_bar(self, canvas, value, vmin, vmax, bad_is_high=True):
-		# Draw background
-		canvas.delete("all")
-		w = int(canvas['width'])
-		h = int(canvas['height'])
-		canvas.create_rectangle(0, 0, w, h, fill="#F4F6F8", outline="")
+			self._speed_steps += steps
+			wall = now - self._speed_since
+			if wall < SPEED_WINDOW:
+				return
+			achieved = self._speed_steps * self.tick_ms / 1000.0 / wall
+			self._speed_steps, self._speed_since = 0, now
+			if achieved >= 0.95 * self.clock.speed:
+				text = f"Running at {self.clock.speed:g}x"
+			else:
+				text = (f"Running at {achieved:.0f}x of {self.clock.speed:g}x: this computer can't keep up "
+						f"(backlog capped at {MAX_BACKLOG} ticks)")
+		if text != self._speed_text:
+			self._speed_text = text
+			self.speed_label.configure(text=text)
+
+	def _frame(self):
+		if not self.running:
+			return
+		now = time.perf_counter()
+
+		# Run every step due since the last frame (none while paused); one
+		# dashboard redraw covers all of them
+		steps = self.clock.advance(now)
+		if steps:
+			ran = self._run_steps(steps, deadline=now + FRAME_BUDGET)
+			# Out of time: the rest are due again next frame
+			self.clock.defer(steps - ran)
+			self._update_dashboard()
+			steps = ran
+		self._show_speed(now, steps)
+
+		# Schedule the next frame on a fixed grid so frame times do not drift;
+		# a frame that ran late skips the grid points it missed
+		self._next_frame += FRAME_MS / 1000.0
+		if self._next_frame < now:
+			self._next_frame = now + FRAME_MS / 1000.0
+		delay = max(1, int((self._next_frame - time.perf_counter()) * 1000))
+		self.popup.after(delay, self._frame)
+
+	def _run_steps(self, steps, deadline=None):
+		# Steps one at a time so every tick lands in the history charts;
+		# stops at the deadline and returns how many ran
+		for ran in range(1, steps + 1):
+			self.sim.step()
+			self._record_history()
+			if deadline is not None and time.perf_counter() > deadline:
+				return ran
+		return steps
 
+	def _update_dashboard(self):
+		sim = self.sim
+		for metric, _, _, _, fmt, vmin, vmax, bad_is_high in METRICS:
+			row = self.metric_rows[metric]
+			value = getattr(sim, metric)
+			# Update numeric label (only when the shown text changes)
+			text = fmt.format(value)
+			if text != row["text"]:
+				row["text"] = text
+				row["label"].configure(text=text)
+			# Update bar (normalized value for visuals)
+			self._draw_bar(row, value, vmin, vmax, bad_is_high)
+		self._draw_charts()
+
+		# Alerts when things 'tank' (the simulation counts the alert ticks)
+		alerts = sim.alerts()
+		text = " ⚠ " + "   •   ".join(alerts) if alerts else ""
+		if text != self.alert_var.get():
+			self.alert_var.set(text)
+			if alerts:
+				self.alert_label.configure(fg="#8B1E1E")
+
+	def _record_history(self):
+		sim = self.sim
+		for series, buffer in self.history.items():
+			buffer.append(getattr(sim, series))
+
+	def _draw_charts(self):
+		w, h = CHART_SIZE
+		top, bottom = 20, h - 4  # plot area below the title
+		for series, _, _, vmin, vmax, fmt in CHARTS:
+			chart, buffer = self.charts[series], self.history[series]
+			if not buffer:
+				continue
+			# Min/max per pixel column: a zig-zag through each column's range
+			columns = min(w, buffer.capacity)
+			scale = (bottom - top) / (vmax - vmin)
+			points = []
+			for i, (lo, hi) in enumerate(buffer.envelope(columns)):
+				x = i * w / columns
+				hi = max(vmin, min(vmax, hi))
+				lo = max(vmin, min(vmax, lo))
+				points += (x, bottom - (hi - vmin) * scale, x, bottom - (lo - vmin) * scale)
+			chart["canvas"].coords(chart["line"], *points)
+			text = fmt.format(buffer.last)
+			if text != chart["text"]:
+				chart["text"] = text
+				chart["canvas"].itemconfigure(chart["value"], text=text)
+
+	def _draw_bar(self, row, value, vmin, vmax, bad_is_high=True):
 		# Normalize value to [0,1]
 		# If bad_is_high=True, larger values are worse (e.g. inflation)
 		frac = (value - vmin) / (vmax - vmin)
 		frac = max(0.0, min(1.0, frac))
 
-		fill_w = int(frac * w)
+		fill_w = int(frac * row["width"])
 
-		# Color depending on value
-		if bad_is_high:
-			# green at low, yellow mid, pink at high
-			color = self._interpolate_color(self.sage, self.pastel_pink, frac)
-		else:
-			# For GDP: green is high, pink is low
-			color = self._interpolate_color(self.pastel_pink, self.sage, frac)
+		# Color depending on value: green when good, pink when bad
+		badness = frac if bad_is_high else 1.0 - frac
+		color = self.gradient[int(badness * (GRADIENT_STEPS - 1) + 0.5)]
 
-		canvas.create_rectangle(0, 0, fill_w, h, fill=color, outline="")
+		# Move / recolor the existing fill only if it looks different
+		shown = (fill_w, color)
+		if shown == row["shown"]:
+			return
+		canvas, fill = row["bar"], row["fill"]
+		if row["shown"] is None or row["shown"][0] != fill_w:
+			canvas.coords(fill, 0, 0, fill_w, row["height"])
+		if row["shown"] is None or row["shown"][1] != color:
+			canvas.itemconfigure(fill, fill=color)
+		row["shown"] = shown
 
 	def _interpolate_color(self, c1, c2, t):
 		# Colors are hex like #RRGGBB; interpolate channels
@@ -293,8 +455,15 @@ class FedMiniGame:
 		b = int(b1 + (b2 - b1) * t)
 		return f"#{r:02x}{g:02x}{b:02x}"
 
+	def _report_result(self):
+		if self.on_result is None or self.result_sent:
+			return
+		self.result_sent = True
+		self.on_result({"game": "fed", **self.sim.summary()})
+
 	def _exit(self):
 		self.running = False
+		self._report_result()
 		try:
 			self.popup.destroy()
 		except Exception:
@@ -0,0 +1,114 @@
+"""Walk-cycle animation for sprites on the world map.
+
+A WalkAtlas packs every frame of a walk cycle, for each of the four
+directions, onto one sprite sheet surface: one row per direction, one
+cell per frame. All transforms (scaling, flipping, the per-frame pose)
+happen once when the atlas is built. Drawing a frame is then a single
+blit of an area of the sheet, and nothing is transformed per frame.
+
+build_walk_atlas() makes such a sheet from one still sprite. The game
+has no drawn walk cycles, so each pose is the sprite bobbing and swaying
+a little. Right-facing frames lean forward; left-facing frames are those
+same frames flipped. Front art is all there is, so "up" reuses the "down"
+poses.
+
+WalkAnimation picks the frame from real elapsed time, not from a frame
+count, so the cycle runs at the same speed at any frame rate.
+"""
+
+import pygame
+
+DIRECTIONS = ("down", "left", "right", "up")
+
+
+class WalkAtlas:
+    def __init__(self, frames, pad=(0, 0)):
+        """frames maps each direction to its list of equally sized surfaces.
+
+        pad is how far the frames extend past the still sprite on the left
+        and top, i.e. where to draw them relative to the sprite's position.
+        """
+        first = frames[DIRECTIONS[0]][0]
+        self.cell = first.get_size()
+        self.pad = pad
+        self.length = len(frames[DIRECTIONS[0]])
+        w, h = self.cell
+        self.sheet = pygame.Surface((w * self.length, h * len(DIRECTIONS)), pygame.SRCALPHA)
+        self.areas = {}
+        for row, direction in enumerate(DIRECTIONS):
+            areas = []
+            for col, frame in enumerate(frames[direction]):
+                area = pygame.Rect(col * w, row * h, w, h)
+                self.sheet.blit(frame, area)
+                areas.append(area)
+            self.areas[direction] = areas
+        self.sheet = self.sheet.convert_alpha()
+
+    def frame_rect(self, pos):
+        """Screen rect covered by a frame of a sprite whose still image sits at pos."""
+        return pygame.Rect(pos[0] - self.pad[0], pos[1] - self.pad[1], *self.cell)
+
+
+def build_walk_atlas(sprite, length=4, scale=1.0, bob=4, sway=3, lean=4):
+    """WalkAtlas of length frames per direction made from a still sprite."""
+    if scale != 1.0:
+        w, h = sprite.get_size()
+        sprite = pygame.transform.smoothscale(sprite, (round(w * scale), round(h * scale)))
+        bob = max(1, round(bob * scale))
+
+    poses = {"down": [], "right": []}
+    for i in range(length):
+        # Feet down on even frames, body raised between steps
+        lift = bob if i % 2 else 0
+        swing = sway if i % 4 == 1 else -sway if i % 4 == 3 else 0
+        poses["down"].append((pygame.transform.rotate(sprite, swing), lift))
+        poses["right"].append((pygame.transform.rotate(sprite, -lean + swing / 2), lift))
+
+    # Every cell is big enough for the largest pose plus the bob; pad is
+    # where the still sprite would sit in a cell
+    cell_w = max(s.get_width() for frames in poses.values() for s, _ in frames)
+    cell_h = max(s.get_height() for frames in poses.values() for s, _ in frames) + bob
+    sw, sh = sprite.get_size()
+    pad = ((cell_w - sw) // 2, (cell_h - bob - sh) // 2 + bob)
+
+    def cell(surface, lift):
+        canvas = pygame.Surface((cell_w, cell_h), pygame.SRCALPHA)
+        ow, oh = surface.get_size()
+        # Rotation grows the image evenly on all sides; keep its centre in place
+        x = pad[0] + (sw - ow) // 2
+        y = pad[1] + (sh - oh) // 2 - lift
+        canvas.blit(surface, (x, y))
+        return canvas
+
+    frames = {direction: [cell(s, lift) for s, lift in poses[direction]] for direction in poses}
+    frames["left"] = [pygame.transform.flip(f, True, False) for f in frames["right"]]
+    frames["up"] = frames["down"]
+    return WalkAtlas(frames, pad)
+
+
+class WalkAnimation:
+    def __init__(self, atlas, fps=8):
+        self.atlas = atlas
+        self.fps = fps
+        self.direction = "down"
+        self.time = 0.0
+
+    def update(self, elapsed, dx=0.0, dy=0.0):
+        """Advance by elapsed seconds; (dx, dy) is this frame's movement."""
+        if dx or dy:
+            if abs(dx) > abs(dy):
+                self.direction = "right" if dx > 0 else "left"
+            else:
+                self.direction = "down" if dy > 0 else "up"
+            self.time += elapsed
+        else:
+            # Standing: the first (feet down) frame of the last direction
+            self.time = 0.0
+
+    @property
+    def index(self):
+        return int(self.time * self.fps) % self.atlas.length
+
+    def frame(self):
+        """(sheet, area) of the current frame, ready for Surface.blit()."""
+        return self.atlas.sheet, self.atlas.areas[self.direction][self.index]
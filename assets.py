@@ -0,0 +1,102 @@
+"""Image loading with a persistent cache of pre-scaled pixels.
+
+Decoding a large PNG and scaling it down is the slowest part of starting
+the homepage. load_image() stores the scaled pixels as raw, uncompressed
+RGB(A) in CACHE_DIR, keyed by a hash of the source file and the target
+size, so later launches only read the bytes back. Editing the source image
+changes its hash, which makes the old entry stale; it is removed when the
+new one is written.
+
+load_image() returns surfaces converted to the display format, so a
+display mode must already be set. load_pixels() stops before that step,
+so it can run on a loader thread (see loader.py).
+"""
+
+import hashlib
+import os
+import struct
+
+import pygame
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+
+_MAGIC = b"GHAC"
+_HEADER = struct.Struct("<4sHH4s")  # magic, width, height, pixel format
+
+
+def source_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def _cache_name(path, size, fmt, digest):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{size[0]}x{size[1]}-{fmt}-{digest}.raw"
+
+
+def read_raw(cache_path, size, fmt):
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, w, h, stored_fmt = _HEADER.unpack_from(data)
+    if magic != _MAGIC or (w, h) != tuple(size) or stored_fmt.rstrip(b" ").decode() != fmt:
+        return None
+    pixels = data[_HEADER.size:]
+    if len(pixels) != w * h * len(fmt):
+        return None
+    return pygame.image.frombytes(pixels, (w, h), fmt)
+
+
+def write_raw(cache_path, surface, fmt):
+    w, h = surface.get_size()
+    tmp_path = cache_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, w, h, fmt.ljust(4).encode()))
+            f.write(pygame.image.tobytes(surface, fmt))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # A read-only checkout just means no cache; the image still loads
+        pass
+
+
+def prune_stale(cache_dir, keep_name):
+    # Entries for the same image/size/format but an older source hash
+    prefix = keep_name.rsplit("-", 1)[0] + "-"
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(prefix) and name != keep_name:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def load_pixels(path, size, alpha=True, cache_dir=CACHE_DIR):
+    """Load path scaled to size, not yet converted; safe off the main thread."""
+    fmt = "RGBA" if alpha else "RGB"
+    size = (int(size[0]), int(size[1]))
+    name = _cache_name(path, size, fmt, source_hash(path))
+    cache_path = os.path.join(cache_dir, name)
+
+    surface = read_raw(cache_path, size, fmt)
+    if surface is None:
+        surface = pygame.transform.scale(pygame.image.load(path), size)
+        write_raw(cache_path, surface, fmt)
+        prune_stale(cache_dir, name)
+    return surface
+
+
+def load_image(path, size, alpha=True, cache_dir=CACHE_DIR):
+    """Load path scaled to size and converted for fast blitting."""
+    surface = load_pixels(path, size, alpha, cache_dir)
+    return surface.convert_alpha() if alpha else surface.convert()
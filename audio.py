@@ -0,0 +1,119 @@
+"""Sound effects and music for the homepage.
+
+AudioManager asks for a small mixer buffer before pygame.init() opens
+the audio device. That buffer, not the decoding, sets how late a click
+is heard: 256 samples at 44.1 kHz is about 6 ms, against about 12 ms
+for the default 512.
+
+Sound effects are decoded up front into a bank of mixer.Sound objects
+and play on channels reserved for them, so a click never waits for a
+free channel or cuts off another sound. Music loading and playback
+start on a background thread, so the window appears without waiting
+for the music.
+
+play() also records click-to-sound latency: the time from when the input
+may have arrived (mark_input(); the homepage passes the end of the
+previous poll, or the moment an idle wait woke on the input) to the play
+call, plus the length of the mixer buffer. Time the input spent queued
+while the previous frame ran therefore counts. latency_ms() reports the
+recent mean.
+
+If there is no audio device, everything here is a silent no-op.
+"""
+
+import threading
+import time
+from collections import deque
+
+import pygame
+
+
+class AudioManager:
+    def __init__(self, frequency=44100, buffer=256, reserved=1):
+        """Must be created before pygame.init(); call start() after it."""
+        self.frequency = frequency
+        self.buffer = buffer
+        self.reserved = reserved
+        self.enabled = False
+        self.sounds = {}
+        self.channels = {}
+        self.latencies = deque(maxlen=32)
+        self._input_time = None
+        self._music_thread = None
+        pygame.mixer.pre_init(frequency, -16, 2, buffer)
+
+    def start(self):
+        """Check the mixer came up and reserve the UI channels."""
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error as e:
+                print(f"Audio disabled: {e}")
+                return
+        self.enabled = True
+        # Reserved channels are never picked by Sound.play(), only by us
+        pygame.mixer.set_reserved(self.reserved)
+
+    @property
+    def buffer_ms(self):
+        init = pygame.mixer.get_init() if self.enabled else None
+        frequency = init[0] if init else self.frequency
+        return 1000.0 * self.buffer / frequency
+
+    # ---------------------------
+    # Sound bank
+    # ---------------------------
+    def load(self, name, path, volume=1.0, channel=None):
+        """Decode path into the bank; channel is a reserved channel index."""
+        if not self.enabled:
+            return
+        sound = pygame.mixer.Sound(path)
+        sound.set_volume(volume)
+        self.sounds[name] = sound
+        if channel is not None:
+            self.channels[name] = pygame.mixer.Channel(channel)
+
+    def mark_input(self, since=None):
+        """Call when a frame's input is read; play() measures from since (default: now)."""
+        self._input_time = time.perf_counter() if since is None else since
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        channel = self.channels.get(name)
+        if channel is not None:
+            channel.play(sound)
+        else:
+            sound.play()
+        if self._input_time is not None:
+            self.latencies.append((time.perf_counter() - self._input_time) * 1000.0 + self.buffer_ms)
+
+    def latency_ms(self):
+        """Mean click-to-sound latency over the recent plays (None before any)."""
+        if not self.latencies:
+            return None
+        return sum(self.latencies) / len(self.latencies)
+
+    # ---------------------------
+    # Music
+    # ---------------------------
+    def play_music(self, path, loops=-1):
+        """Load and start path on a background thread."""
+        if not self.enabled:
+            return
+        self._music_thread = threading.Thread(target=self._load_music, args=(path, loops), daemon=True)
+        self._music_thread.start()
+
+    def _load_music(self, path, loops):
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play(loops)
+        except pygame.error as e:
+            print(f"Music failed to start: {e}")
+
+    def close(self):
+        # The music thread must be done with the mixer before pygame.quit()
+        if self._music_thread is not None:
+            self._music_thread.join(timeout=2.0)
+            self._music_thread = None
@@ -0,0 +1,262 @@
+"""Layered avatar customization.
+
+An avatar is a look: one choice per layer in LAYERS (base, bottom, top,
+hair, accessory), drawn bottom to top into a single sprite. The base is
+one of the outfit images; the other layers either blit an image or are
+drawn procedurally relative to the body's bounding box, so they fit any
+base without per-outfit art.
+
+AvatarCompositor builds a composite the first time a look is asked for
+and keeps the most recent ones in an LRU, so a screen showing an avatar
+blits one surface per frame however many layers it has. The look the
+player picked is also written to CACHE_DIR (choices as JSON, pixels as a
+raw file, see assets.py), so the next launch reads the finished sprite
+back instead of decoding and compositing the layer images.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import pygame
+
+from assets import CACHE_DIR, load_image, read_raw, source_hash, write_raw
+
+LAYERS = ("base", "bottom", "top", "hair", "accessory")
+
+LOOK_FILE = "avatar-look.json"
+
+
+# ---------------------------
+# Layer options
+# ---------------------------
+class ImageLayer:
+    """A layer drawn from an image file scaled to the avatar size."""
+
+    def __init__(self, label, path):
+        self.label = label
+        self.path = path
+        self._digest = None
+
+    def key(self):
+        if self._digest is None:
+            self._digest = source_hash(self.path)
+        return ("image", os.path.basename(self.path), self._digest)
+
+    def apply(self, canvas, body, compositor):
+        canvas.blit(compositor.image(self.path), (0, 0))
+
+
+class TintLayer:
+    """Recolours a horizontal band of the body, as fractions of its height."""
+
+    def __init__(self, label, color, band):
+        self.label = label
+        self.color = color
+        self.band = band
+
+    def key(self):
+        return ("tint", self.color, self.band)
+
+    def apply(self, canvas, body, compositor):
+        top = body.top + int(body.height * self.band[0])
+        bottom = body.top + int(body.height * self.band[1])
+        # Multiplies RGB only, so transparent pixels stay transparent
+        canvas.fill(self.color, (body.left, top, body.width, bottom - top), special_flags=pygame.BLEND_RGB_MULT)
+
+
+class ShapeLayer:
+    """A small shape (bow, glasses, badge...) drawn by draw(canvas, body)."""
+
+    def __init__(self, label, draw):
+        self.label = label
+        self.draw = draw
+
+    def key(self):
+        return ("shape", self.label)
+
+    def apply(self, canvas, body, compositor):
+        self.draw(canvas, body)
+
+
+def _bow(canvas, body):
+    cx, y = body.centerx, body.top + max(2, body.height // 30)
+    w = max(6, body.width // 5)
+    pygame.draw.polygon(canvas, (250, 123, 174), [(cx, y), (cx - w, y - w // 2), (cx - w, y + w // 2)])
+    pygame.draw.polygon(canvas, (250, 123, 174), [(cx, y), (cx + w, y - w // 2), (cx + w, y + w // 2)])
+    pygame.draw.circle(canvas, (160, 32, 240), (cx, y), max(2, w // 4))
+
+
+def _headband(canvas, body):
+    y = body.top + body.height // 16
+    pygame.draw.line(canvas, (160, 32, 240), (body.centerx - body.width // 5, y),
+                     (body.centerx + body.width // 5, y), max(2, body.height // 40))
+
+
+def _glasses(canvas, body):
+    y = body.top + body.height * 2 // 9
+    r = max(3, body.width // 14)
+    for cx in (body.centerx - r - 1, body.centerx + r + 1):
+        pygame.draw.circle(canvas, (40, 40, 40), (cx, y), r, 1)
+
+
+def _badge(canvas, body):
+    center = (body.centerx - body.width // 6, body.top + body.height // 2)
+    pygame.draw.circle(canvas, (255, 215, 0), center, max(3, body.width // 12))
+
+
+def _necklace(canvas, body):
+    top = body.top + body.height * 9 // 20
+    w = body.width // 3
+    pygame.draw.arc(canvas, (255, 215, 0), (body.centerx - w // 2, top - w // 3, w, w // 2), 3.4, 6.0, 2)
+
+
+def default_catalogue(outfit_paths):
+    """Options per layer; index 0 of every layer but the base is "none"."""
+    return {
+        "base": [ImageLayer(f"outfit {i + 1}", path) for i, path in enumerate(outfit_paths)],
+        "bottom": [None, TintLayer("pink", (255, 170, 210), (0.68, 1.0)),
+                   TintLayer("denim", (150, 170, 255), (0.68, 1.0))],
+        "top": [None, TintLayer("lilac", (215, 170, 255), (0.42, 0.68)),
+                TintLayer("mint", (170, 255, 210), (0.42, 0.68))],
+        "hair": [None, ShapeLayer("bow", _bow), ShapeLayer("headband", _headband)],
+        "accessory": [None, ShapeLayer("glasses", _glasses), ShapeLayer("badge", _badge),
+                      ShapeLayer("necklace", _necklace)],
+    }
+
+
+# ---------------------------
+# Compositor
+# ---------------------------
+class AvatarCompositor:
+    def __init__(self, catalogue, size, max_entries=16, cache_dir=CACHE_DIR):
+        self.catalogue = catalogue
+        self.size = (int(size[0]), int(size[1]))
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._composites = OrderedDict()
+        self._images = {}
+        self._keys = {}
+
+    def default_look(self, base=0):
+        return (base,) + (0,) * (len(LAYERS) - 1)
+
+    def label(self, layer, choice):
+        option = self.catalogue[layer][choice]
+        return option.label if option is not None else "none"
+
+    def cycle(self, look, layer, step=1):
+        """look with layer switched to its next (or previous) option."""
+        i = LAYERS.index(layer)
+        look = list(look)
+        look[i] = (look[i] + step) % len(self.catalogue[layer])
+        return tuple(look)
+
+    def image(self, path):
+        surface = self._images.get(path)
+        if surface is None:
+            surface = self._images[path] = load_image(path, self.size)
+        return surface
+
+    def add_image(self, path, surface):
+        """Use an already loaded and converted surface for path."""
+        self._images[path] = surface
+
+    def key(self, look):
+        """Identity of a composite: every option's own key plus the size."""
+        digest = self._keys.get(look)
+        if digest is None:
+            parts = [self.size]
+            for layer, choice in zip(LAYERS, look):
+                option = self.catalogue[layer][choice]
+                parts.append(option.key() if option is not None else None)
+            digest = self._keys[look] = hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+        return digest
+
+    def composite(self, look):
+        """The sprite for look, built on first use."""
+        look = tuple(look)
+        surface = self._composites.get(look)
+        if surface is not None:
+            self.hits += 1
+            self._composites.move_to_end(look)
+            return surface
+        self.misses += 1
+        surface = self._build(look)
+        self._remember(look, surface)
+        return surface
+
+    def _remember(self, look, surface):
+        self._composites[look] = surface
+        while len(self._composites) > self.max_entries:
+            self._composites.popitem(last=False)
+
+    def _build(self, look):
+        canvas = pygame.Surface(self.size, pygame.SRCALPHA)
+        options = [self.catalogue[layer][choice] for layer, choice in zip(LAYERS, look)]
+        options[0].apply(canvas, None, self)
+        body = canvas.get_bounding_rect()
+        for option in options[1:]:
+            if option is not None:
+                option.apply(canvas, body, self)
+        return canvas.convert_alpha()
+
+    # ---------------------------
+    # Persisted look
+    # ---------------------------
+    def _look_path(self):
+        return os.path.join(self.cache_dir, LOOK_FILE)
+
+    def _pixels_path(self, look):
+        return os.path.join(self.cache_dir, f"avatar-{self.size[0]}x{self.size[1]}-{self.key(look)}.raw")
+
+    def save_look(self, look):
+        """Remember look (and its pixels) as the player's choice."""
+        look = tuple(look)
+        pixels_path = self._pixels_path(look)
+        if not os.path.exists(pixels_path):
+            write_raw(pixels_path, self.composite(look), "RGBA")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._look_path(), "w") as f:
+                json.dump({"look": dict(zip(LAYERS, look)), "pixels": os.path.basename(pixels_path)}, f)
+        except OSError:
+            return
+        self._prune(os.path.basename(pixels_path))
+
+    def read_look(self):
+        """(look, unconverted pixels or None) as saved; None if there is none.
+
+        Safe off the main thread; use_look() then makes it current.
+        """
+        try:
+            with open(self._look_path()) as f:
+                data = json.load(f)
+            look = tuple(int(data["look"][layer]) for layer in LAYERS)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not all(0 <= choice < len(self.catalogue[layer]) for layer, choice in zip(LAYERS, look)):
+            return None
+        # Only found if nothing the look is made of has changed since
+        return look, read_raw(self._pixels_path(look), self.size, "RGBA")
+
+    def use_look(self, look, pixels):
+        if pixels is not None and look not in self._composites:
+            self._remember(look, pixels.convert_alpha())
+        return look
+
+    def _prune(self, keep_name):
+        prefix = f"avatar-{self.size[0]}x{self.size[1]}-"
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(prefix) and name != keep_name:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
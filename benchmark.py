@@ -0,0 +1,342 @@
+"""Headless frame-time benchmark for the homepage.
+
+Drives each homepage screen for a number of frames with scripted input,
+using SDL's dummy video and audio drivers so it runs without a display
+(e.g. in CI). Frames are stepped back to back with no frame limiting.
+
+For every scenario it reports p50/p95/p99 frame time and, from a second
+pass under tracemalloc (kept separate so tracing does not skew timings),
+the mean bytes allocated at peak and net memory blocks kept per frame.
+The "npcs" scenario fills the map with --npcs wandering NPCs (default
+1000) and the last column says whether p99 fits a 60 FPS frame.
+
+It then times startup: constructing the homepage up to its first frame,
+and the click-to-sound latency of pressing "start" (see audio.py). Headless
+frames do not sleep, so a live session can add up to one active frame of
+queueing before the click is read (idle waits end as soon as input comes);
+that bound is reported next to it.
+
+--replay FILE plays back a session recorded with GAME_RECORD=FILE (see
+recording.py) as fast as possible instead, reporting frame times per
+screen and whether the replay ended in the recorded state.
+
+Run: python3 benchmark.py [--frames N] [--scenario NAME ...] [--json FILE]
+     [--max-p95 MS] [--startup-runs N]
+     python3 benchmark.py --replay FILE [--replay FILE ...] [--json FILE] [--max-p95 MS]
+
+With --max-p95 the exit status is 1 if any scenario's p95 is above the
+limit, so it can guard against regressions.
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+import homepage  # noqa: E402
+from recording import read_session  # noqa: E402
+
+
+class HeldKeys:
+    """Minimal stand-in for pygame.key.get_pressed() with a set of held keys."""
+
+    def __init__(self, held=()):
+        self.held = set(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+def _key(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+
+
+def _click(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+
+def _motion(pos):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(1, 0), buttons=(0, 0, 0))
+
+
+# ---------------------------
+# Scenarios
+# ---------------------------
+# Each scenario puts a fresh game on its screen and returns a function
+# frame -> (events, held keys) producing that frame's scripted input.
+
+def scenario_menu(game):
+    game.current_screen = "menu"
+
+    def script(frame):
+        return [_motion((frame % homepage.WIDTH, 100))], HeldKeys()
+    return script
+
+
+def scenario_character(game):
+    game.current_screen = "character"
+
+    def script(frame):
+        events = [_motion((frame % homepage.WIDTH, 300))]
+        if frame % 10 == 0:
+            x, y = homepage.outfit_positions[(frame // 10) % len(homepage.outfit_positions)]
+            events.append(_click((x + 75, y + 75)))
+        return events, HeldKeys()
+    return script
+
+
+def scenario_chat(game):
+    game.current_screen = "chat"
+    game.set_character(game.outfits[0])
+
+    def script(frame):
+        # Walk through every question: ask, answer "2", hold the reply
+        phase = frame % 30
+        if phase == 0:
+            game.current_chat = (frame // 30) % len(homepage.chat_queue)
+            game.chat_state = "question"
+            game.selected_option = None
+        if phase == 10:
+            return [_key(pygame.K_2)], HeldKeys()
+        return [], HeldKeys()
+    return script
+
+
+def scenario_play(game):
+    game.current_screen = "play"
+    game.set_character(game.outfits[0])
+    directions = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+
+    def script(frame):
+        return [], HeldKeys([directions[(frame // 60) % len(directions)]])
+    return script
+
+
+def scenario_flood(game):
+    # The chat screen under a burst of input every frame: busy mouse
+    # movement, wheel spins and a key held down with OS key repeat
+    game.current_screen = "chat"
+    game.set_character(game.outfits[0])
+
+    def script(frame):
+        events = [_motion(((frame + i) % homepage.WIDTH, 300)) for i in range(200)]
+        events += [pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=1, flipped=False) for _ in range(20)]
+        events += [_key(pygame.K_a) for _ in range(10)]
+        return events, HeldKeys()
+    return script
+
+
+NPC_BENCH_COUNT = 1000
+
+
+def scenario_npcs(game, count=NPC_BENCH_COUNT):
+    # The play screen with a crowd far beyond what the game spawns
+    script = scenario_play(game)
+    game.crowd.spawn(max(0, count - len(game.crowd)))
+    return script
+
+
+SCENARIOS = {
+    "menu": scenario_menu,
+    "character": scenario_character,
+    "chat": scenario_chat,
+    "play": scenario_play,
+    "flood": scenario_flood,
+    "npcs": scenario_npcs,
+}
+
+
+# ---------------------------
+# Measurement
+# ---------------------------
+# A scenario "holds 60 FPS" when its p99 frame fits in one 60 Hz frame
+FRAME_BUDGET_MS = 1000.0 / 60
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_frames(game, script, frames, trace=False):
+    times, peaks, blocks = [], [], []
+    for frame in range(frames):
+        events, keys = script(frame)
+        if trace:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            blocks_before = sys.getallocatedblocks()
+        start = time.perf_counter()
+        game.step(events, keys)
+        elapsed = time.perf_counter() - start
+        if trace:
+            # Read both counters before appending, which allocates itself
+            net_blocks = sys.getallocatedblocks() - blocks_before
+            peak = tracemalloc.get_traced_memory()[1] - before
+            peaks.append(peak)
+            blocks.append(net_blocks)
+        times.append(elapsed)
+    return times, peaks, blocks
+
+
+def bench_scenario(name, setup, frames, warmup=30):
+    game = homepage.HomepageGame(launch_minigames=False)
+    try:
+        # Scenarios start on their screen, so everything must be loaded
+        game.assets.wait()
+        script = setup(game)
+        run_frames(game, script, warmup)
+        times, _, _ = run_frames(game, script, frames)
+
+        tracemalloc.start()
+        try:
+            _, peaks, blocks = run_frames(game, script, frames, trace=True)
+        finally:
+            tracemalloc.stop()
+    finally:
+        game.close()
+
+    result = summarize(name, times)
+    result["alloc_peak_bytes_per_frame"] = sum(peaks) / len(peaks)
+    result["net_blocks_per_frame"] = sum(blocks) / len(blocks)
+    return result
+
+
+def summarize(name, seconds):
+    ms = sorted(t * 1000.0 for t in seconds)
+    return {
+        "scenario": name,
+        "frames": len(ms),
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": ms[-1] if ms else 0.0,
+        "mean_ms": sum(ms) / len(ms) if ms else 0.0,
+    }
+
+
+def bench_replay(path):
+    setup, frames, digest = read_session(path)
+    game = homepage.HomepageGame(launch_minigames=False, seed=setup["seed"])
+    by_screen = {}
+    try:
+        game.apply_setup(setup)
+        start = time.perf_counter()
+        for elapsed_ms, keys, events in frames:
+            screen = game.current_screen
+            frame_start = time.perf_counter()
+            game.step(events, keys, elapsed_ms / 1000.0)
+            by_screen.setdefault(screen, []).append(time.perf_counter() - frame_start)
+        wall = time.perf_counter() - start
+        matches = None if digest is None else game.state_digest() == digest
+    finally:
+        game.close()
+    return {
+        "replay": path,
+        "frames": len(frames),
+        "recorded_s": sum(f[0] for f in frames) / 1000.0,
+        "replay_s": wall,
+        "state_matches": matches,
+        "screens": [summarize(screen, seconds) for screen, seconds in by_screen.items()],
+    }
+
+
+def print_replay(result):
+    matches = {None: "unknown (no trailer)", True: "yes", False: "NO"}[result["state_matches"]]
+    print(f"{result['replay']}: {result['frames']} frames, {result['recorded_s']:.1f} s recorded, "
+          f"replayed in {result['replay_s']:.2f} s; final state matches: {matches}")
+    print(f"{'screen':<12}{'frames':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for r in result["screens"]:
+        print(f"{r['scenario']:<12}{r['frames']:>8}{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}"
+              f"{r['p99_ms']:>9.3f}{r['max_ms']:>9.3f}")
+
+
+def bench_startup(runs):
+    first_frame, latency = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        game = homepage.HomepageGame(launch_minigames=False)
+        try:
+            game.step([], HeldKeys())
+            first_frame.append((time.perf_counter() - start) * 1000.0)
+            game.step([_click(game.button_box.center)], HeldKeys())
+            if game.audio.latency_ms() is not None:
+                latency.append(game.audio.latency_ms())
+        finally:
+            game.close()
+    first_frame.sort()
+    return {
+        "first_frame_ms": percentile(first_frame, 50),
+        "click_latency_ms": sum(latency) / len(latency) if latency else None,
+        "audio_buffer_ms": game.audio.buffer_ms,
+        "max_frame_wait_ms": 1000.0 / homepage.FPS,
+    }
+
+
+def print_report(results):
+    print(f"{'scenario':<12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'alloc B/frame':>15}{'net blocks':>12}{'60 FPS':>8}")
+    for r in results:
+        holds = "yes" if r["p99_ms"] <= FRAME_BUDGET_MS else "no"
+        print(f"{r['scenario']:<12}{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}{r['p99_ms']:>9.3f}"
+              f"{r['alloc_peak_bytes_per_frame']:>15.0f}{r['net_blocks_per_frame']:>12.2f}{holds:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600, help="frames per scenario")
+    parser.add_argument("--npcs", type=int, default=NPC_BENCH_COUNT, help="NPCs in the npcs scenario")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable; default: all)")
+    parser.add_argument("--startup-runs", type=int, default=3, help="launches to time (0: skip)")
+    parser.add_argument("--replay", action="append", metavar="FILE",
+                        help="replay a recorded session instead of the scenarios (repeatable)")
+    parser.add_argument("--json", metavar="FILE", help="also write results as JSON")
+    parser.add_argument("--max-p95", type=float, metavar="MS",
+                        help="exit with status 1 if any p95 frame time exceeds MS")
+    args = parser.parse_args(argv)
+    if args.replay:
+        replays = [bench_replay(path) for path in args.replay]
+        for result in replays:
+            print_replay(result)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(replays, f, indent=2)
+        failed = any(r["state_matches"] is False for r in replays)
+        if args.max_p95 is not None:
+            failed |= any(s["p95_ms"] > args.max_p95 for r in replays for s in r["screens"])
+        return 1 if failed else 0
+
+    scenarios = dict(SCENARIOS, npcs=functools.partial(scenario_npcs, count=args.npcs))
+
+    results = [bench_scenario(name, scenarios[name], args.frames) for name in (args.scenario or SCENARIOS)]
+    print_report(results)
+
+    startup = bench_startup(args.startup_runs) if args.startup_runs > 0 else None
+    if startup:
+        latency = startup["click_latency_ms"]
+        print(f"\nfirst frame {startup['first_frame_ms']:.1f} ms, click-to-sound "
+              f"{'n/a' if latency is None else f'{latency:.1f} ms'} "
+              f"(mixer buffer {startup['audio_buffer_ms']:.1f} ms; live sessions add up to "
+              f"{startup['max_frame_wait_ms']:.1f} ms waiting for the next frame)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            # Same shape either way; startup is null with --startup-runs 0
+            json.dump({"scenarios": results, "startup": startup}, f, indent=2)
+
+    if args.max_p95 is not None and any(r["p95_ms"] > args.max_p95 for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
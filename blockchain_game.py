@@ -4,11 +4,15 @@ import time
 import threading
 
 class BlockchainGame:
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, parent=None, on_result=None):
+        self.root = tk.Toplevel(parent) if parent else tk.Tk()
+        # Called with a dict summarising the outcome when the game ends
+        self.on_result = on_result
+        self.result_sent = False
         self.root.title("Blockchain Transaction Game")
         self.root.geometry("1000x700")
         self.root.configure(bg='#E8F4FD')  # Light blue background
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_game)
         
         # Game state
         self.game_running = False
@@ -575,14 +579,32 @@ class BlockchainGame:
                 self.create_blockchain_link()
             elif self.current_instruction_step == 5:  # Final success
                 self.separate_next_button.pack_forget()
+                self.report_result()
         else:
             # Game complete
             self.separate_next_button.pack_forget()
             
+    def report_result(self):
+        """Send the outcome to on_result (once)"""
+        if self.on_result is None or self.result_sent:
+            return
+        self.result_sent = True
+        self.on_result({
+            "game": "blockchain",
+            "completed": self.current_instruction_step >= len(self.instruction_steps) - 1,
+            "steps_done": self.current_instruction_step,
+            "steps_total": len(self.instruction_steps) - 1,
+        })
+
     def exit_game(self):
         """Exit the game"""
         self.game_running = False
-        self.root.quit()
+        self.report_result()
+        if isinstance(self.root, tk.Toplevel):
+            # Hosted inside another Tk app: close only our window
+            self.root.destroy()
+        else:
+            self.root.quit()
         
     def run(self):
         """Start the game"""
@@ -0,0 +1,49 @@
+"""Dirty-rectangle bookkeeping for the homepage screens.
+
+Each frame a screen describes the regions whose look depends on state
+(a selection border, the chat text, the avatar) as name -> (rect, state).
+DirtyRenderer compares that with the previous frame and returns only the
+rectangles that need repainting and pushing with display.update(). An
+empty list means nothing changed and the frame can be skipped entirely.
+"""
+
+import pygame
+
+
+class DirtyRenderer:
+    def __init__(self, size, enabled=True):
+        self.full_rect = pygame.Rect((0, 0), size)
+        self.enabled = enabled
+        self._screen = None
+        self._regions = {}
+        self._force_full = True
+
+    def invalidate(self):
+        """Force a full repaint on the next frame (window exposed, resized, ...)."""
+        self._force_full = True
+
+    def dirty_rects(self, screen_name, regions):
+        if not self.enabled or self._force_full or screen_name != self._screen:
+            rects = [self.full_rect.copy()]
+        else:
+            rects = []
+            for name in self._regions.keys() | regions.keys():
+                old = self._regions.get(name)
+                new = regions.get(name)
+                if old == new:
+                    continue
+                if old is not None:
+                    rects.append(old[0])
+                if new is not None:
+                    rects.append(pygame.Rect(new[0]))
+            rects = [r.clip(self.full_rect) for r in rects if r.colliderect(self.full_rect)]
+
+        self._screen = screen_name
+        self._regions = {name: (pygame.Rect(rect), state) for name, (rect, state) in regions.items()}
+        self._force_full = False
+        return rects
+
+
+def clip_union(rects):
+    """Single rect covering all of rects, used as the clip while repainting."""
+    return rects[0].unionall(rects[1:])
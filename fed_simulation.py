@@ -0,0 +1,127 @@
+"""The Fed mini-game's economy, without any UI.
+
+FedSimulation holds the inflation, unemployment and GDP state and
+advances it one tick at a time. A tick uses the same rules the popup has
+always used: policy influence is the neutral rate minus the current
+rate, each metric moves by a fixed multiple of that plus uniform noise,
+and the result is clamped to a sensible range. A tick counts as an alert
+tick when a metric is past one of the ALERTS thresholds afterwards.
+
+step(n) runs n ticks in one tight loop and fast_forward() runs the
+ticks that would fit in a stretch of wall-clock time. A whole session,
+or a rate path, can therefore be played out instantly for testing,
+hints and difficulty tuning. FedMiniGame in FedReserveMiniGame.py is a
+view over one of these, stepped as often as its speed setting asks.
+
+With a seed the noise is reproducible: two simulations with the same
+seed and the same rates end in the same state.
+"""
+
+import random
+
+TICK_MS = 250
+
+# Per-tick response to influence (neutral - rate) and noise half-widths
+INFLATION_RESPONSE = -0.03
+UNEMPLOYMENT_RESPONSE = 0.04
+GDP_RESPONSE = -0.12
+INFLATION_NOISE = 0.05
+UNEMPLOYMENT_NOISE = 0.03
+GDP_NOISE = 0.08
+
+INFLATION_RANGE = (-1.0, 20.0)
+UNEMPLOYMENT_RANGE = (0.0, 40.0)
+GDP_RANGE = (50.0, 200.0)
+
+# (metric, comparison, threshold, message)
+ALERTS = (
+    ("inflation", ">", 8.0, "High inflation — prices rising rapidly!"),
+    ("unemployment", ">", 12.0, "Unemployment spike — too many people out of work!"),
+    ("gdp", "<", 90.0, "GDP falling — economy shrinking!"),
+)
+
+
+class FedSimulation:
+    def __init__(self, rate=2.5, neutral_rate=2.5, inflation=2.0, unemployment=5.0, gdp=100.0, seed=None):
+        self.rate = rate
+        self.neutral_rate = neutral_rate
+        self.inflation = inflation
+        self.unemployment = unemployment
+        self.gdp = gdp
+        self.ticks = 0
+        self.alert_ticks = 0
+        self.rng = random.Random(seed)
+
+    def step(self, n=1):
+        """Advance n ticks at the current rate; returns how many were alert ticks."""
+        influence = self.neutral_rate - self.rate
+        inflation_push = INFLATION_RESPONSE * influence
+        unemployment_push = UNEMPLOYMENT_RESPONSE * influence
+        gdp_push = GDP_RESPONSE * influence
+        # random.uniform(-a, a) is -a + 2a * random(); spelled out inline, in
+        # the same order of additions as the original _tick
+        inflation_base, inflation_spread = -INFLATION_NOISE, 2 * INFLATION_NOISE
+        unemployment_base, unemployment_spread = -UNEMPLOYMENT_NOISE, 2 * UNEMPLOYMENT_NOISE
+        gdp_base, gdp_spread = -GDP_NOISE, 2 * GDP_NOISE
+        inflation_low, inflation_high = INFLATION_RANGE
+        unemployment_low, unemployment_high = UNEMPLOYMENT_RANGE
+        gdp_low, gdp_high = GDP_RANGE
+        (_, _, inflation_alert, _), (_, _, unemployment_alert, _), (_, _, gdp_alert, _) = ALERTS
+
+        inflation, unemployment, gdp = self.inflation, self.unemployment, self.gdp
+        noise = self.rng.random
+        alerts = 0
+        for _ in range(n):
+            inflation += inflation_push + (inflation_base + inflation_spread * noise())
+            unemployment += unemployment_push + (unemployment_base + unemployment_spread * noise())
+            gdp += gdp_push + (gdp_base + gdp_spread * noise())
+            if inflation < inflation_low:
+                inflation = inflation_low
+            elif inflation > inflation_high:
+                inflation = inflation_high
+            if unemployment < unemployment_low:
+                unemployment = unemployment_low
+            elif unemployment > unemployment_high:
+                unemployment = unemployment_high
+            if gdp < gdp_low:
+                gdp = gdp_low
+            elif gdp > gdp_high:
+                gdp = gdp_high
+            if inflation > inflation_alert or unemployment > unemployment_alert or gdp < gdp_alert:
+                alerts += 1
+
+        self.inflation, self.unemployment, self.gdp = inflation, unemployment, gdp
+        self.ticks += n
+        self.alert_ticks += alerts
+        return alerts
+
+    def fast_forward(self, seconds, tick_ms=TICK_MS):
+        """Run the ticks the popup would run in seconds of play."""
+        return self.step(int(seconds * 1000 // tick_ms))
+
+    def run(self, rates):
+        """Play out a rate path, one rate per tick; returns the alert ticks."""
+        alerts = 0
+        for rate in rates:
+            self.rate = rate
+            alerts += self.step(1)
+        return alerts
+
+    def alerts(self):
+        """Messages for the alert thresholds the current state is past."""
+        out = []
+        for metric, comparison, threshold, message in ALERTS:
+            value = getattr(self, metric)
+            if value > threshold if comparison == ">" else value < threshold:
+                out.append(message)
+        return out
+
+    def summary(self):
+        return {
+            "ticks": self.ticks,
+            "alert_ticks": self.alert_ticks,
+            "rate": round(self.rate, 2),
+            "inflation": round(self.inflation, 2),
+            "unemployment": round(self.unemployment, 2),
+            "gdp": round(self.gdp, 2),
+        }
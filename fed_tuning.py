@@ -0,0 +1,252 @@
+"""Monte Carlo evaluation of rate policies for the Fed mini-game.
+
+Runs the FedSimulation tick rules (see fed_simulation.py) for many
+independent economies at once with NumPy. Each metric is one array with
+an element per economy, so a tick is a handful of array operations
+however many economies there are. A policy decides the rate every tick
+from the current state. It can be a constant, a threshold rule, a
+Taylor-style rule, or any callable
+
+    policy(tick, inflation, unemployment, gdp) -> rate (scalar or array)
+
+and its rates are clipped to the popup slider's range.
+
+For each alert (and for "any" alert) evaluate() reports the share of
+economies it fired in, the share of ticks it was active, and how soon it
+first fired (mean and median over the economies it fired in). The model
+parameters (neutral rate, noise half-widths, alert thresholds) can be
+overridden, so sweep() can run a grid of policies and parameters in a
+process pool, one evaluation per job, to calibrate difficulty.
+
+Run: python3 fed_tuning.py [--economies N] [--seconds S] [--sweep NAME=V1,V2 ...]
+     [--processes N] [--seed N] [--json FILE]
+
+NumPy is needed here only; the game itself does not use it.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import fed_simulation as sim
+
+RATE_RANGE = (-1.0, 10.0)  # the popup slider's range
+SESSION_SECONDS = 300
+
+DEFAULT_PARAMS = {
+    "neutral_rate": 2.5,
+    "inflation_noise": sim.INFLATION_NOISE,
+    "unemployment_noise": sim.UNEMPLOYMENT_NOISE,
+    "gdp_noise": sim.GDP_NOISE,
+    "inflation_alert": sim.ALERTS[0][2],
+    "unemployment_alert": sim.ALERTS[1][2],
+    "gdp_alert": sim.ALERTS[2][2],
+}
+ALERT_NAMES = ("inflation", "unemployment", "gdp", "any")
+
+
+# ---------------------------
+# Policies
+# ---------------------------
+class Constant:
+    def __init__(self, rate):
+        self.rate = rate
+        self.name = f"constant {rate:g}"
+
+    def __call__(self, tick, inflation, unemployment, gdp):
+        return self.rate
+
+
+class ThresholdRule:
+    def __init__(self, neutral=2.5, move=1.5, inflation_above=4.0, unemployment_above=7.0):
+        """Neutral, moved by +-move while inflation or unemployment is past its trigger."""
+        self.neutral = neutral
+        self.move = move
+        self.inflation_above = inflation_above
+        self.unemployment_above = unemployment_above
+        self.name = f"threshold +-{move:g}"
+
+    def __call__(self, tick, inflation, unemployment, gdp):
+        rate = np.full(inflation.shape, self.neutral)
+        rate[unemployment > self.unemployment_above] -= self.move
+        rate[inflation > self.inflation_above] += self.move
+        return rate
+
+
+class TaylorRule:
+    def __init__(self, neutral=2.5, target_inflation=2.0, natural_unemployment=5.0,
+                 inflation_weight=0.5, unemployment_weight=0.5):
+        """neutral + (1 + inflation_weight) * inflation gap - unemployment_weight * unemployment gap.
+
+        That is the classic Taylor rule with neutral as the nominal neutral
+        rate (real neutral + target inflation) and an Okun-style
+        unemployment gap in place of the output gap.
+        """
+        self.neutral = neutral
+        self.target_inflation = target_inflation
+        self.natural_unemployment = natural_unemployment
+        self.inflation_weight = inflation_weight
+        self.unemployment_weight = unemployment_weight
+        self.name = f"taylor {inflation_weight:g}/{unemployment_weight:g}"
+
+    def __call__(self, tick, inflation, unemployment, gdp):
+        inflation_gap = inflation - self.target_inflation
+        unemployment_gap = unemployment - self.natural_unemployment
+        return (self.neutral + inflation_gap + self.inflation_weight * inflation_gap
+                - self.unemployment_weight * unemployment_gap)
+
+
+def standard_policies():
+    return [Constant(2.5), Constant(4.0), ThresholdRule(), TaylorRule()]
+
+
+# ---------------------------
+# Evaluation
+# ---------------------------
+def evaluate(policy, economies=10000, ticks=SESSION_SECONDS * 1000 // sim.TICK_MS, seed=None, **params):
+    """Run economies parallel sessions of ticks ticks under policy; returns a report dict."""
+    unknown = params.keys() - DEFAULT_PARAMS.keys()
+    if unknown:
+        raise ValueError(f"unknown model parameters: {', '.join(sorted(unknown))}")
+    p = dict(DEFAULT_PARAMS, **params)
+    rng = np.random.default_rng(seed)
+    start = sim.FedSimulation()
+    inflation = np.full(economies, start.inflation)
+    unemployment = np.full(economies, start.unemployment)
+    gdp = np.full(economies, start.gdp)
+
+    # Per tick: metric += response * influence - noise + 2 * noise * U[0, 1)
+    responses = np.array([sim.INFLATION_RESPONSE, sim.UNEMPLOYMENT_RESPONSE, sim.GDP_RESPONSE])[:, None]
+    noise = np.array([p["inflation_noise"], p["unemployment_noise"], p["gdp_noise"]])[:, None]
+    state = np.stack([inflation, unemployment, gdp])
+    inflation, unemployment, gdp = state  # views into state
+    low = np.array([sim.INFLATION_RANGE[0], sim.UNEMPLOYMENT_RANGE[0], sim.GDP_RANGE[0]])[:, None]
+    high = np.array([sim.INFLATION_RANGE[1], sim.UNEMPLOYMENT_RANGE[1], sim.GDP_RANGE[1]])[:, None]
+
+    active = np.zeros((4, economies), dtype=np.int32)  # alert ticks per economy
+    first = np.full((4, economies), -1, dtype=np.int32)  # tick each alert first fired
+    firing = np.empty((4, economies), dtype=bool)
+    draws = np.empty((3, economies))
+    step = np.empty((3, economies))
+    for tick in range(ticks):
+        rate = np.clip(policy(tick, inflation, unemployment, gdp), *RATE_RANGE)
+        influence = p["neutral_rate"] - rate
+        rng.random(out=draws)
+        np.multiply(draws, 2 * noise, out=step)
+        step += responses * influence - noise
+        state += step
+        np.clip(state, low, high, out=state)
+
+        np.greater(inflation, p["inflation_alert"], out=firing[0])
+        np.greater(unemployment, p["unemployment_alert"], out=firing[1])
+        np.less(gdp, p["gdp_alert"], out=firing[2])
+        np.logical_or.reduce(firing[:3], out=firing[3])
+        active += firing
+        first[firing & (first < 0)] = tick + 1
+
+    alerts = {}
+    for i, name in enumerate(ALERT_NAMES):
+        fired = first[i] >= 0
+        first_ticks = first[i][fired]
+        alerts[name] = {
+            "fired": float(fired.mean()),
+            "active": float(active[i].mean() / ticks) if ticks else 0.0,
+            "first_tick_mean": float(first_ticks.mean()) if first_ticks.size else None,
+            "first_tick_median": float(np.median(first_ticks)) if first_ticks.size else None,
+        }
+    return {
+        "policy": getattr(policy, "name", repr(policy)),
+        "params": params,
+        "economies": economies,
+        "ticks": ticks,
+        "alerts": alerts,
+        "final": {"inflation": float(inflation.mean()), "unemployment": float(unemployment.mean()),
+                  "gdp": float(gdp.mean())},
+    }
+
+
+def _evaluate_job(job):
+    policy, params, economies, ticks, seed = job
+    return evaluate(policy, economies, ticks, seed, **params)
+
+
+def sweep(policies, grid=None, economies=10000, ticks=SESSION_SECONDS * 1000 // sim.TICK_MS,
+          seed=0, processes=None):
+    """evaluate() every policy against every combination in grid ({param: values}).
+
+    Jobs run in a process pool; each gets its own seed derived from seed,
+    so results do not depend on the pool size. Policies go to the workers
+    by pickling, so they must be module-level classes or functions; with
+    a lambda or closure among them, everything runs in this process.
+    """
+    grid = grid or {}
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+    jobs = [(policy, params) for params in combos for policy in policies]
+    seeds = np.random.SeedSequence(seed).spawn(len(jobs))
+    jobs = [(policy, params, economies, ticks, s) for (policy, params), s in zip(jobs, seeds)]
+    try:
+        pickle.dumps(policies)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        processes = 1
+    if processes == 1 or len(jobs) == 1:
+        return [_evaluate_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_evaluate_job, jobs))
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def _seconds(ticks):
+    return "-" if ticks is None else f"{ticks * sim.TICK_MS / 1000:.0f}s"
+
+
+def print_report(results):
+    print(f"{'policy':<18} {'params':<26} {'any alert':>9} {'first':>6} {'alert time':>10}  "
+          + "  ".join(f"{name:>12}" for name in ALERT_NAMES[:3]))
+    for r in results:
+        params = " ".join(f"{k}={v:g}" for k, v in r["params"].items()) or "-"
+        a = r["alerts"]
+        per_alert = "  ".join(f"{100 * a[n]['fired']:5.1f}% {_seconds(a[n]['first_tick_median']):>5}"
+                              for n in ALERT_NAMES[:3])
+        print(f"{r['policy']:<18} {params:<26} {100 * a['any']['fired']:8.1f}% "
+              f"{_seconds(a['any']['first_tick_median']):>6} {100 * a['any']['active']:9.1f}%  {per_alert}")
+
+
+def _grid_option(text):
+    name, _, values = text.partition("=")
+    if name not in DEFAULT_PARAMS or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=V1,V2,... with NAME one of {', '.join(DEFAULT_PARAMS)}")
+    return name, [float(v) for v in values.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--economies", type=int, default=10000, help="parallel economies per evaluation")
+    parser.add_argument("--seconds", type=float, default=SESSION_SECONDS, help="session length in play seconds")
+    parser.add_argument("--sweep", action="append", type=_grid_option, default=[], metavar="NAME=V1,V2",
+                        help="model parameter values to sweep (repeatable; combinations are crossed)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="FILE", help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    ticks = int(args.seconds * 1000 // sim.TICK_MS)
+    results = sweep(standard_policies(), dict(args.sweep), args.economies, ticks, args.seed, args.processes)
+    print(f"{args.economies} economies x {ticks} ticks; alert columns: economies fired in, median time to first")
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Font lookup with a persistent family -> file cache.
+
+pygame.font.SysFont scans the system fonts (fc-list on Linux) the first
+time it is used, which is a noticeable part of homepage start-up. The
+registry resolves each (family, bold, italic) to a font file once, keeps
+the answer in CACHE_DIR/fonts.json and on later runs opens the file
+directly. Families that are not installed are remembered as missing and
+fall back to pygame's default font, like SysFont does; delete the cache
+file after installing fonts to pick them up. Also like SysFont, a bold or
+italic style the family has no file for is emulated (set_bold/set_italic)
+on the file it does have; the cache records which styles need that.
+
+LazyFont defers opening the font until a screen first renders with it.
+"""
+
+import json
+import os
+
+import pygame
+
+from assets import CACHE_DIR
+
+FONT_CACHE = os.path.join(CACHE_DIR, "fonts.json")
+
+
+class LazyFont:
+    """Stand-in for pygame.font.Font that loads the font on first use."""
+
+    def __init__(self, registry, family, size, bold=False, italic=False):
+        self._registry = registry
+        self._spec = (family, size, bold, italic)
+        self._font = None
+
+    @property
+    def font(self):
+        if self._font is None:
+            self._font = self._registry.font(*self._spec)
+        return self._font
+
+    @property
+    def loaded(self):
+        return self._font is not None
+
+    def render(self, *args, **kwargs):
+        return self.font.render(*args, **kwargs)
+
+    def size(self, text):
+        return self.font.size(text)
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+
+class FontRegistry:
+    def __init__(self, cache_path=FONT_CACHE):
+        self.cache_path = cache_path
+        self._paths = self._load()
+        self._fonts = {}
+
+    def _load(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self):
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._paths, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def resolve(self, family, bold=False, italic=False):
+        """(path, emulate bold, emulate italic) for family; path None is pygame's default font."""
+        key = f"{family.lower()}|{int(bold)}|{int(italic)}"
+        entry = self._paths.get(key)
+        # Entries are [path, emulate bold, emulate italic]; anything else is stale
+        if isinstance(entry, list) and len(entry) == 3:
+            path = entry[0]
+            if path is None or os.path.exists(path):
+                return tuple(entry)
+        # Cache miss (or the file moved): this is the only place that scans
+        match = pygame.font.match_font
+        path = match(family, bold, italic)
+        # match_font quietly falls back to a less styled file; the styles
+        # that file lacks are emulated, as SysFont does
+        plain = match(family) if bold or italic else path
+        emulate_bold = bold and path in (plain, match(family, False, italic))
+        emulate_italic = italic and path in (plain, match(family, bold, False))
+        self._paths[key] = [path, emulate_bold, emulate_italic]
+        self._save()
+        return path, emulate_bold, emulate_italic
+
+    def font(self, family, size, bold=False, italic=False):
+        spec = (family, size, bold, italic)
+        font = self._fonts.get(spec)
+        if font is None:
+            path, emulate_bold, emulate_italic = self.resolve(family, bold, italic)
+            font = pygame.font.Font(path, size)
+            # Same emulation SysFont applies when a style (or the family) is missing
+            font.set_bold(emulate_bold)
+            font.set_italic(emulate_italic)
+            self._fonts[spec] = font
+        return font
+
+    def lazy(self, family, size, bold=False, italic=False):
+        return LazyFont(self, family, size, bold, italic)
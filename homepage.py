@@ -1,27 +1,79 @@
+import functools
+import math
 import os
 import pygame
-from pygame import mixer
 import sys
-import subprocess
-
-# ---------------------------
-# Initialize Pygame
-# ---------------------------
-pygame.init()
-mixer.init()
-
-# Load background music and click sound
-mixer.music.load('cutemusic.ogg')
-mixer.music.play(-1)
-click_sound = mixer.Sound("mouse-click.ogg")
-click_sound.set_volume(0.5)
+import time
+import zlib
+from assets import BASE_DIR, load_pixels
+from fonts import FontRegistry
+from minigame_host import MiniGameLauncher
+from render_cache import LayerCache, TextCache
+from dirty_render import DirtyRenderer, clip_union
+from timing import FixedTimestep, FramePacer
+from world_map import Camera, TiledMap
+from spatial_hash import Zone, ZoneMap, color_mask_zones
+from navigation import NavGrid, PathPlanner
+from npcs import NPCCrowd
+from avatar import LAYERS, AvatarCompositor, default_catalogue
+from animation import WalkAnimation, build_walk_atlas
+from audio import AudioManager
+from loader import AssetLoader
+from perf_hud import PerfHUD
+from recording import SessionRecorder
+from input_events import EventRouter, coalesce
 
 # ---------------------------
 # Window
 # ---------------------------
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Finance Game with Character Customization")
+FPS = 60
+IDLE_FPS = 20
+# Toggles the performance overlay (or start with GAME_PERF_HUD=1)
+PERF_HUD_KEY = pygame.K_F3
+# Mixer buffer in samples; smaller means clicks are heard sooner
+AUDIO_BUFFER = 256
+
+# Simulation runs at a fixed rate regardless of the frame rate
+SIM_HZ = 60
+AVATAR_SPEED = 300  # pixels per second (the old 5 px per frame at 60 FPS)
+# The play screen scrolls over map.png at its native resolution
+WORLD_SIZE = (1178, 1187)
+AVATAR_SIZE = 150
+# Collisions use the avatar's feet, not the whole sprite
+FOOTPRINT = pygame.Rect(50, 130, 50, 20)
+
+# Map stalls (world coordinates) and the mini-game walking into them opens
+MAP_TRIGGERS = [
+   ("Trade Port", (170, 565, 175, 220), "fed"),
+   ("Blockchain stall", (478, 268, 177, 224), "blockchain"),
+   ("Credit stall", (812, 435, 178, 220), "credit"),
+]
+# Map colours that cannot be walked on: (name, colour, per-channel tolerance).
+# The feet must cover OBSTACLE_MIN_PIXELS of them to be blocked.
+OBSTACLE_MIN_PIXELS = 150
+MAP_OBSTACLE_COLORS = [
+   ("water", (133, 196, 188), (24, 16, 16, 255)),
+   ("rock", (134, 129, 133), (16, 16, 16, 255)),
+]
+
+# Assets each screen needs before it is shown (see AssetLoader); until
+# they are in, a loading screen stands in for it
+SCREEN_ASSETS = {"character": ("outfits",), "play": ("world", "npcs")}
+# Main-thread time per frame for finishing loaded assets
+LOAD_BUDGET = 0.004
+
+# Click-to-move: walkability grid resolution and A* nodes expanded per frame
+NAV_CELL = 16
+NAV_NODES_PER_FRAME = 400
+
+# Students (the outfits) and mentors wandering the map
+NPC_COUNT = 20
+NPC_SPRITES = [("outfit1.png", (90, 90)), ("outfit2.png", (90, 90)), ("outfit3.png", (90, 90)),
+               ("outfit4.png", (90, 90)), ("man1.png", (81, 90))]
+NPC_WEIGHTS = [1, 1, 1, 1, 0.5]
+
+MOVE_KEYS = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
 
 # ---------------------------
 # Colors
@@ -35,33 +87,13 @@ BOX_BORDER = (200, 200, 200)
 NAME_COLOR = (255, 255, 0)
 TEXT_COLOR = WHITE
 
-# ---------------------------
-# Fonts
-# ---------------------------
-title_font = pygame.font.SysFont("lucidahandwriting", 70, italic=True)
-subtitle_font = pygame.font.SysFont("Segoe Script", 50)
-button_font = pygame.font.SysFont("arial", 40)
-FONT = pygame.font.SysFont("Georgia", 24)
-
-# ---------------------------
-# Menu setup
-# ---------------------------
-title_text = title_font.render("a girl's guide to finance", True, WHITE)
-title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
-
-button_text = button_font.render("start", True, WHITE)
-button_rect = button_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-button_box = pygame.Rect(button_rect.left - 20, button_rect.top - 10,
-                        button_rect.width + 40, button_rect.height + 20)
-
 # ---------------------------
 # Character customization
 # ---------------------------
-subtitle_text = subtitle_font.render("character customization! choose your avatar.", True, WHITE)
-subtitle_rect = subtitle_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 150))
+SUBTITLE = "character customization! choose your avatar."
+subtitle_center = (WIDTH // 2, HEIGHT // 2 - 150)
 
 outfit_files = ["outfit1.png", "outfit2.png", "outfit3.png", "outfit4.png"]
-outfits = [pygame.transform.scale(pygame.image.load(f), (150, 150)) for f in outfit_files]
 
 outfit_positions = [
    (WIDTH // 5 - 75, 200),
@@ -70,13 +102,11 @@ outfit_positions = [
    (4 * WIDTH // 5 - 75, 200)
 ]
 
-selected_outfit = None
-character_sprite = None
-
-char_continue_text = button_font.render("continue", True, WHITE)
-char_continue_rect = char_continue_text.get_rect(center=(WIDTH // 2, HEIGHT - 100))
-char_continue_box = pygame.Rect(char_continue_rect.left - 20, char_continue_rect.top - 10,
-                               char_continue_rect.width + 40, char_continue_rect.height + 20)
+# Layers customizable on top of the chosen outfit, one button each; a
+# click cycles through that layer's options
+layer_buttons = [(layer, pygame.Rect((i + 1) * WIDTH // 5 - 75, 380, 150, 36))
+                 for i, layer in enumerate(LAYERS[1:])]
+layer_row = pygame.Rect(0, 375, WIDTH, 46)
 
 # ---------------------------
 # Chat setup
@@ -84,11 +114,6 @@ char_continue_box = pygame.Rect(char_continue_rect.left - 20, char_continue_rect
 BOX_X, BOX_Y = 50, 400
 BOX_WIDTH, BOX_HEIGHT = 700, 150
 
-back_text = button_font.render("back", True, WHITE)
-back_rect = back_text.get_rect(topright=(WIDTH - 50, 50))
-back_box = pygame.Rect(back_rect.left - 10, back_rect.top - 5,
-                      back_rect.width + 20, back_rect.height + 10)
-
 conversations = {
    "federal reserve": [
        ("Invisible Mentor: Welcome to the Trade Port! Do you want to learn about federal reserve?",
@@ -111,173 +136,740 @@ conversations = {
 }
 
 chat_queue = [entry for topic in conversations for entry in conversations[topic]]
-current_chat = 0
-chat_state = "question"
-selected_option = None
-
-# ---------------------------
-# Play screen setup
-# ---------------------------
-char_x, char_y = WIDTH // 2, HEIGHT // 2
-speed = 5
 
-map_background = pygame.image.load("map.png").convert()
-map_background = pygame.transform.scale(map_background, (WIDTH, HEIGHT))
 
-# ---------------------------
-# Helper functions
-# ---------------------------
-def draw_chat_box():
-   pygame.draw.rect(screen, BOX_COLOR, (BOX_X, BOX_Y, BOX_WIDTH, BOX_HEIGHT))
-   pygame.draw.rect(screen, BOX_BORDER, (BOX_X, BOX_Y, BOX_WIDTH, BOX_HEIGHT), 3)
-
-def draw_wrapped_text(text, x, y, max_width, color=TEXT_COLOR, line_height=25):
-   words = text.split(' ')
-   lines, current_line = [], ""
-   for word in words:
-       test_line = current_line + word + " "
-       if FONT.size(test_line)[0] <= max_width:
-           current_line = test_line
+class HomepageGame:
+   """The homepage: menu, character selection, mentor chat and the map.
+
+   run() is the interactive loop. step() advances exactly one frame from
+   the given events (and optional key state), without frame limiting, so
+   the game can also be driven headless by benchmark.py. The elapsed time
+   passed to step() feeds a fixed-timestep simulation; when omitted, one
+   nominal frame (1 / FPS) is assumed so headless runs are deterministic.
+   seed fixes the NPCs' wandering, e.g. to replay a recorded session.
+   """
+
+   def __init__(self, launch_minigames=True, seed=None):
+       # ---------------------------
+       # Initialize Pygame
+       # ---------------------------
+       self.audio = AudioManager(buffer=AUDIO_BUFFER)
+       pygame.init()
+
+       self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+       pygame.display.set_caption("Finance Game with Character Customization")
+
+       # Click sound preloaded on its own channel; music starts in the background
+       self.audio.start()
+       self.audio.load("click", os.path.join(BASE_DIR, "mouse-click.ogg"), volume=0.5, channel=0)
+       self.audio.play_music(os.path.join(BASE_DIR, "cutemusic.ogg"))
+
+       # ---------------------------
+       # Fonts
+       # ---------------------------
+       # Resolved through a cached registry and opened the first time they render
+       font_registry = FontRegistry()
+       self.title_font = font_registry.lazy("lucidahandwriting", 70, italic=True)
+       self.subtitle_font = font_registry.lazy("Segoe Script", 50)
+       self.button_font = font_registry.lazy("arial", 40)
+       self.chat_font = font_registry.lazy("Georgia", 24)
+
+       # Wrapped/rendered text is cached so unchanged dialogue only costs blits
+       self.text_cache = TextCache()
+       # Each screen's static content, composed once (see build_layer)
+       self.layers = LayerCache()
+
+       # ---------------------------
+       # Menu setup
+       # ---------------------------
+       self.title_text = self.title_font.render("a girl's guide to finance", True, WHITE)
+       self.title_rect = self.title_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
+
+       self.button_text = self.button_font.render("start", True, WHITE)
+       self.button_rect = self.button_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+       self.button_box = pygame.Rect(self.button_rect.left - 20, self.button_rect.top - 10,
+                                     self.button_rect.width + 40, self.button_rect.height + 20)
+
+       # ---------------------------
+       # Character customization
+       # ---------------------------
+       self.avatars = AvatarCompositor(default_catalogue([os.path.join(BASE_DIR, f) for f in outfit_files]),
+                                       (AVATAR_SIZE, AVATAR_SIZE))
+       # Loaded in the background (see load_outfits)
+       self.outfits = []
+       self.look = None
+       self.selected_outfit = None
+       self.character_sprite = None
+       self.walk = None
+
+       self.char_continue_text = self.button_font.render("continue", True, WHITE)
+       self.char_continue_rect = self.char_continue_text.get_rect(center=(WIDTH // 2, HEIGHT - 100))
+       self.char_continue_box = pygame.Rect(self.char_continue_rect.left - 20, self.char_continue_rect.top - 10,
+                                            self.char_continue_rect.width + 40, self.char_continue_rect.height + 20)
+
+       # ---------------------------
+       # Chat setup
+       # ---------------------------
+       self.back_text = self.button_font.render("back", True, WHITE)
+       self.back_rect = self.back_text.get_rect(topright=(WIDTH - 50, 50))
+       self.back_box = pygame.Rect(self.back_rect.left - 10, self.back_rect.top - 5,
+                                   self.back_rect.width + 20, self.back_rect.height + 10)
+
+       self.current_chat = 0
+       self.chat_state = "question"
+       self.selected_option = None
+
+       # ---------------------------
+       # Play screen setup
+       # ---------------------------
+       # Simulated world position (float) and the one before the last step;
+       # the avatar is drawn interpolated between them at char_x, char_y
+       self.pos = (float(WORLD_SIZE[0] // 2), float(WORLD_SIZE[1] // 2))
+       self.prev_pos = self.pos
+       self.char_x, self.char_y = WORLD_SIZE[0] // 2, WORLD_SIZE[1] // 2
+       self.timestep = FixedTimestep(1 / SIM_HZ)
+
+       # Latest outcome reported by each mini-game, keyed by game name
+       self.minigame_results = {}
+
+       # The map, zones, navigation and NPCs arrive from load_world
+       self.seed = seed
+       self.world = None
+       self.camera = Camera((WIDTH, HEIGHT), WORLD_SIZE)
+       self.zones = ZoneMap()
+       # Trigger zones the avatar is standing in (entering one fires it)
+       self.inside_zones = set()
+       self.nav_grid = None
+       self.planner = None
+       self.crowd = None
+       self.follow_avatar()
+
+       # Everything after the menu loads on a worker thread while it shows
+       self.assets = AssetLoader()
+       self.assets.submit("outfits", self.load_outfits, self.finish_outfits)
+       self.assets.submit("npcs", self.load_world, self.finish_npcs)
+
+       # ---------------------------
+       # Main loop state
+       # ---------------------------
+       self.current_screen = "menu"
+       self.running = True
+       self.clock = pygame.time.Clock()
+       self.pacer = FramePacer(FPS, IDLE_FPS)
+       self.fps = FPS
+       # Input arriving after this was not in the last poll (click latency starts there)
+       self.input_since = None
+       self.last_tick = time.perf_counter()
+       # Set GAME_FULL_REDRAW=1 to repaint and flip the whole window every frame
+       self.renderer = DirtyRenderer((WIDTH, HEIGHT), enabled=os.environ.get("GAME_FULL_REDRAW") != "1")
+       # Set GAME_PERF_LOG=<file> to log every frame's timings (rotated at 1 MB)
+       self.hud = PerfHUD(visible=os.environ.get("GAME_PERF_HUD") == "1",
+                          log_path=os.environ.get("GAME_PERF_LOG"), stats=self.cache_stats)
+
+       # Handlers per screen; only these event types reach the queue (see
+       # input_events.py). While a screen is loading, only the common ones.
+       self.router = EventRouter(
+           {pygame.QUIT: self.on_quit, pygame.VIDEOEXPOSE: self.on_expose,
+            pygame.WINDOWEXPOSED: self.on_expose, pygame.KEYDOWN: self.on_key},
+           {"menu": {pygame.MOUSEBUTTONDOWN: self.on_menu_click},
+            "character": {pygame.MOUSEBUTTONDOWN: self.on_character_click},
+            "chat": {pygame.MOUSEBUTTONDOWN: self.on_chat_click, pygame.KEYDOWN: self.on_chat_key},
+            "play": {pygame.MOUSEBUTTONDOWN: self.on_play_click, pygame.KEYDOWN: self.on_play_key}})
+       self.router.activate(self.active_screen())
+
+       # Warm up Tk and the mini-games in the background while the menu is shown
+       self.minigames = MiniGameLauncher() if launch_minigames else None
+       if self.minigames:
+           self.minigames.start()
+
+   # ---------------------------
+   # Asset loading
+   # ---------------------------
+   # load_* run on the loader thread and must not convert(); finish_* get
+   # their results on the main thread.
+   def load_outfits(self, put):
+       paths = [os.path.join(BASE_DIR, f) for f in outfit_files]
+       return [load_pixels(path, (AVATAR_SIZE, AVATAR_SIZE)) for path in paths], self.avatars.read_look()
+
+   def finish_outfits(self, payload):
+       pixels, saved = payload
+       for f, surface in zip(outfit_files, pixels):
+           self.avatars.add_image(os.path.join(BASE_DIR, f), surface.convert_alpha())
+       self.outfits = [self.avatars.image(os.path.join(BASE_DIR, f)) for f in outfit_files]
+       # Preselect the look saved last time; its sprite comes from the cache
+       if saved and self.look is None:
+           self.look = self.avatars.use_look(*saved)
+           self.selected_outfit = self.look[0]
+       return self.outfits
+
+   def load_world(self, put):
+       world = TiledMap(os.path.join(BASE_DIR, "map.png"), WORLD_SIZE)
+       # Walkability depends on the map pixels and the obstacle rules only
+       nav_key = (world.source_digest, MAP_OBSTACLE_COLORS, OBSTACLE_MIN_PIXELS, tuple(FOOTPRINT))
+       nav_grid = NavGrid.load(nav_key, WORLD_SIZE, NAV_CELL)
+       if nav_grid is None:
+           # First run with this map: build (and cache) the grid here, with
+           # obstacle masks of its own made from unconverted tile pixels
+           zones = ZoneMap()
+           for zone in self.obstacle_zones(world, world.read_tile):
+               zones.add(zone)
+           nav_grid = NavGrid.load_or_build(nav_key, WORLD_SIZE, NAV_CELL,
+                                            functools.partial(self.feet_walkable, zones=zones))
+       put("world", (world, nav_grid), self.finish_world)
+       # The tiles around the start position, one per piece so that
+       # converting them is spread over frames
+       cols, rows = world.tile_range(self.camera.rect)
+       for row in rows:
+           for col in cols:
+               put(f"tile {col},{row}", (col, row, world.read_tile(col, row)), lambda tile: world.add_tile(*tile))
+       return [load_pixels(os.path.join(BASE_DIR, f), size) for f, size in NPC_SPRITES]
+
+   def finish_world(self, payload):
+       world, nav_grid = payload
+       self.world = world
+       # A fresh map rather than adding to the old one, so that finishing
+       # the world again (a load retry) cannot duplicate zones
+       zones = ZoneMap()
+       for name, rect, game in MAP_TRIGGERS:
+           zones.add(Zone(name, rect, "trigger", action=game))
+       for zone in self.obstacle_zones(world):
+           zones.add(zone)
+       self.zones = zones
+       self.nav_grid = nav_grid
+       self.planner = PathPlanner(nav_grid, NAV_NODES_PER_FRAME)
+       return world
+
+   def obstacle_zones(self, world, read=None):
+       return [zone for name, color, tolerance in MAP_OBSTACLE_COLORS
+               for zone in color_mask_zones(world, name, color, tolerance,
+                                            min_overlap=OBSTACLE_MIN_PIXELS, read=read)]
+
+   def finish_npcs(self, pixels):
+       self.crowd = NPCCrowd([surface.convert_alpha() for surface in pixels], WORLD_SIZE, self.nav_grid,
+                             seed=self.seed)
+       self.crowd.spawn(NPC_COUNT, NPC_WEIGHTS)
+       return self.crowd
+
+   def cache_stats(self):
+       stats = {"text": (self.text_cache.hits, self.text_cache.misses),
+                "layer": (self.layers.hits, self.layers.builds),
+                "avatar": (self.avatars.hits, self.avatars.misses)}
+       if self.world:
+           stats["tile"] = (self.world.tile_hits, self.world.tile_loads)
+       return stats
+
+   def screen_ready(self, name=None):
+       return self.assets.ready(*SCREEN_ASSETS.get(name or self.current_screen, ()))
+
+   def screen_failed(self, name=None):
+       """Assets of the screen whose load failed, even on the main thread."""
+       return self.assets.failed(*SCREEN_ASSETS.get(name or self.current_screen, ()))
+
+   def active_screen(self):
+       """The screen input and drawing go to: current_screen, or "loading"."""
+       return self.current_screen if self.screen_ready() else "loading"
+
+   # ---------------------------
+   # Helper functions
+   # ---------------------------
+   def draw_chat_box(self, surface):
+       pygame.draw.rect(surface, BOX_COLOR, (BOX_X, BOX_Y, BOX_WIDTH, BOX_HEIGHT))
+       pygame.draw.rect(surface, BOX_BORDER, (BOX_X, BOX_Y, BOX_WIDTH, BOX_HEIGHT), 3)
+
+   def screen_regions(self):
+       # State-dependent regions of the current screen: name -> (rect, state)
+       if self.current_screen == "character" and self.selected_outfit is not None:
+           x, y = outfit_positions[self.selected_outfit]
+           return {"selection": ((x - 5, y - 5, 160, 160), self.look),
+                   "layers": (layer_row, self.look)}
+       if self.current_screen == "chat":
+           return {"chat": ((BOX_X, BOX_Y, BOX_WIDTH, BOX_HEIGHT),
+                            (self.current_chat, self.chat_state, self.selected_option))}
+       if self.current_screen == "play":
+           # Any camera movement repaints the whole view
+           return {"world": ((0, 0, WIDTH, HEIGHT), self.camera.rect.topleft),
+                   "npcs": ((0, 0, WIDTH, HEIGHT), tuple(self.crowd.visible)),
+                   "avatar": self.avatar_region(),
+                   "results": ((10, 10, WIDTH - 20, 30), self.results_summary())}
+       return {}
+
+   def results_summary(self):
+       parts = []
+       credit = self.minigame_results.get("credit")
+       if credit:
+           parts.append(f"Credit: {'won' if credit['won'] else 'lost'} ({credit['score']})")
+       if "fed" in self.minigame_results:
+           parts.append(f"Fed: {self.minigame_results['fed']['ticks']} ticks")
+       blockchain = self.minigame_results.get("blockchain")
+       if blockchain:
+           parts.append("Blockchain: done" if blockchain["completed"] else "Blockchain: unfinished")
+       return "   ".join(parts)
+
+   def draw_wrapped_text(self, text, x, y, max_width, color=TEXT_COLOR, line_height=25):
+       self.text_cache.draw(self.screen, text, self.chat_font, x, y, color, max_width, line_height)
+
+   def launch_minigame(self, game):
+       # One window per game: walking back into its zone (or asking the
+       # mentor) while it is still open does not start another
+       if self.minigames is None or self.minigames.is_open(game):
+           return
+       try:
+           self.minigames.launch(game)
+       except Exception as e:
+           print(f"Mini-game launch failed: {e}")
+
+   # ---------------------------
+   # Events
+   # ---------------------------
+   def handle_event(self, event):
+       self.router.dispatch(self.active_screen(), event)
+
+   def on_quit(self, event):
+       self.running = False
+
+   def on_expose(self, event):
+       self.renderer.invalidate()
+
+   def on_key(self, event):
+       if event.key == PERF_HUD_KEY:
+           self.hud.toggle()
+       elif event.key == pygame.K_ESCAPE and self.screen_failed():
+           self.current_screen = "menu"
+
+   # Menu
+   def on_menu_click(self, event):
+       if self.button_box.collidepoint(event.pos):
+           self.audio.play("click")
+           self.current_screen = "character"
+
+   # Character selection
+   def on_character_click(self, event):
+       for i, (x, y) in enumerate(outfit_positions):
+           rect = pygame.Rect(x, y, 150, 150)
+           if rect.collidepoint(event.pos):
+               self.selected_outfit = i
+               # Keep the layer choices when switching outfits
+               self.look = (i,) + (self.look[1:] if self.look else self.avatars.default_look()[1:])
+       if self.selected_outfit is not None:
+           for layer, rect in layer_buttons:
+               if rect.collidepoint(event.pos):
+                   self.look = self.avatars.cycle(self.look, layer)
+       if self.selected_outfit is not None and self.char_continue_box.collidepoint(event.pos):
+           self.audio.play("click")
+           self.set_character(self.avatars.composite(self.look))
+           self.avatars.save_look(self.look)
+           self.current_screen = "chat"
+           self.current_chat = 0
+           self.chat_state = "question"
+           self.selected_option = None
+
+   # Chat events
+   def on_chat_click(self, event):
+       if self.back_box.collidepoint(event.pos):
+           self.audio.play("click")
+           self.current_screen = "menu"
+
+   def on_chat_key(self, event):
+       self.audio.play("click")
+       if self.chat_state == "options":
+           if event.key == pygame.K_1:
+               self.selected_option = 0
+               self.chat_state = "reply"
+           elif event.key == pygame.K_2:
+               self.selected_option = 1
+               self.chat_state = "reply"
+       elif self.chat_state == "reply" and event.key == pygame.K_SPACE:
+           # Launch mini-game if option 1 was selected
+           q_text = chat_queue[self.current_chat][0]
+           if "Trade Port" in q_text and self.selected_option == 0:
+               self.launch_minigame("fed")
+           elif "credit score" in q_text and self.selected_option == 0:
+               self.launch_minigame("credit")
+           elif "blockchain" in q_text and self.selected_option == 0:
+               self.launch_minigame("blockchain")
+
+           self.current_screen = "play"
+
+   # Play screen events
+   def on_play_click(self, event):
+       if event.button == 1:
+           # Click-to-move: plan from the feet to the clicked map point
+           target = (event.pos[0] + self.camera.rect.x, event.pos[1] + self.camera.rect.y)
+           self.planner.request(self.feet(), target)
+
+   def on_play_key(self, event):
+       if event.key == pygame.K_SPACE:
+           self.audio.play("click")
+           self.current_chat += 1
+           if self.current_chat >= len(chat_queue):
+               self.running = False
+           else:
+               self.chat_state = "question"
+               self.selected_option = None
+               self.current_screen = "chat"
+
+   # ---------------------------
+   # Update
+   # ---------------------------
+   def follow_avatar(self):
+       half = AVATAR_SIZE // 2
+       self.camera.follow((self.char_x + half, self.char_y + half))
+
+   def set_character(self, sprite):
+       # Every walk frame is made here, once, not while walking
+       self.character_sprite = sprite
+       self.walk = WalkAnimation(build_walk_atlas(sprite))
+
+   def avatar_screen_rect(self):
+       return pygame.Rect(self.camera.to_screen((self.char_x, self.char_y)), (AVATAR_SIZE, AVATAR_SIZE))
+
+   def avatar_region(self):
+       if self.walk is None:
+           return self.avatar_screen_rect(), None
+       return (self.walk.atlas.frame_rect(self.avatar_screen_rect().topleft),
+               (self.walk.direction, self.walk.index))
+
+   def move_direction(self, keys):
+       dx = dy = 0
+       for key, (kx, ky) in MOVE_KEYS.items():
+           if keys[key]:
+               dx += kx
+               dy += ky
+       return dx, dy
+
+   def footprint(self, x, y):
+       return FOOTPRINT.move(round(x), round(y))
+
+   def feet(self):
+       return self.pos[0] + FOOTPRINT.centerx, self.pos[1] + FOOTPRINT.centery
+
+   def feet_walkable(self, fx, fy, zones=None):
+       x, y = fx - FOOTPRINT.centerx, fy - FOOTPRINT.centery
+       if not (0 <= x <= WORLD_SIZE[0] - AVATAR_SIZE and 0 <= y <= WORLD_SIZE[1] - AVATAR_SIZE):
+           return False
+       return not (zones or self.zones).blocked(self.footprint(x, y))
+
+   def path_direction(self, dt):
+       # Velocity (in units of AVATAR_SPEED) that heads for the next waypoint
+       # and stops exactly on it rather than overshooting
+       path = self.planner.path
+       fx, fy = self.feet()
+       reach = AVATAR_SPEED * dt
+       while path:
+           tx, ty = path[0]
+           dist = math.hypot(tx - fx, ty - fy)
+           if dist > reach:
+               return (tx - fx) / dist, (ty - fy) / dist
+           path.pop(0)
+           if dist > 0.5:
+               return (tx - fx) / reach, (ty - fy) / reach
+       return 0.0, 0.0
+
+   def simulate(self, dx, dy, dt):
+       # One fixed step of avatar movement; each axis is undone separately
+       # when it would walk into an obstacle, so the avatar slides along it
+       x, y = self.pos
+       new_x = max(0.0, min(WORLD_SIZE[0] - AVATAR_SIZE, x + dx * AVATAR_SPEED * dt))
+       if not self.zones.blocked(self.footprint(new_x, y)):
+           x = new_x
+       new_y = max(0.0, min(WORLD_SIZE[1] - AVATAR_SIZE, y + dy * AVATAR_SPEED * dt))
+       if not self.zones.blocked(self.footprint(x, new_y)):
+           y = new_y
+       self.prev_pos = self.pos
+       self.pos = (x, y)
+
+   def check_triggers(self):
+       inside = {zone for zone in self.zones.zones_at(self.footprint(*self.pos), "trigger")}
+       for zone in inside - self.inside_zones:
+           if zone.action:
+               self.launch_minigame(zone.action)
+       self.inside_zones = inside
+
+   def update(self, keys, elapsed):
+       """Advance the simulation; returns True while something is moving."""
+       if self.minigames:
+           for result in self.minigames.poll_results():
+               self.minigame_results[result.get("game")] = result
+
+       if not self.screen_ready():
+           failed = self.screen_failed()
+           if not failed:
+               # Keep frames coming so the loading screen goes as soon as it can
+               return True
+           # The background load failed: load synchronously instead (one
+           # hitch); if that fails too, the error screen stays up, idle
+           if not self.assets.load_now(*failed):
+               return False
+       if self.current_screen != "play":
+           self.timestep.reset()
+           return False
+
+       dx, dy = self.move_direction(keys)
+       if dx or dy:
+           # Arrow keys always win over click-to-move
+           self.planner.cancel()
        else:
-           lines.append(current_line)
-           current_line = word + " "
-   lines.append(current_line)
-   for i, line in enumerate(lines):
-       rendered = FONT.render(line, True, color)
-       screen.blit(rendered, (x, y + i * line_height))
-
-# ---------------------------
-# Main loop
-# ---------------------------
-current_screen = "menu"
-running = True
-clock = pygame.time.Clock()
-
-while running:
-   dt = clock.tick(60)
-
-   for event in pygame.event.get():
-       if event.type == pygame.QUIT:
-           running = False
-
-       # Menu
-       if current_screen == "menu" and event.type == pygame.MOUSEBUTTONDOWN:
-           if button_box.collidepoint(event.pos):
-               click_sound.play()
-               current_screen = "character"
-
-       # Character selection
-       elif current_screen == "character" and event.type == pygame.MOUSEBUTTONDOWN:
+           self.planner.step()
+       following = bool(self.planner.path)
+       start = self.pos
+
+       for _ in range(self.timestep.advance(elapsed)):
+           if following:
+               dx, dy = self.path_direction(self.timestep.step)
+           before = self.pos
+           self.simulate(dx, dy, self.timestep.step)
+           if following and self.pos == before and (dx or dy):
+               # The coarse grid let the path clip an obstacle; give up
+               self.planner.cancel()
+               following = False
+               dx = dy = 0
+       moving = bool(dx or dy or following or self.planner.status == "searching")
+       if moving:
+           self.check_triggers()
+       else:
+           self.prev_pos = self.pos
+
+       alpha = self.timestep.alpha
+       (px, py), (x, y) = self.prev_pos, self.pos
+       self.char_x = round(px + (x - px) * alpha)
+       self.char_y = round(py + (y - py) * alpha)
+       self.follow_avatar()
+       self.world.prefetch(self.camera.rect)
+       if self.walk:
+           self.walk.update(elapsed, self.pos[0] - start[0], self.pos[1] - start[1])
+
+       # NPCs walking on camera count as motion, so they animate at the
+       # full frame rate; off-camera ones do not hold it up
+       shown = self.crowd.visible
+       self.crowd.update(elapsed)
+       return self.crowd.cull(self.camera) != shown or moving
+
+   # ---------------------------
+   # Drawing
+   # ---------------------------
+   def static_layer(self, name):
+       # Rebuilt only if an input changes: the window size for every screen
+       return self.layers.get(name, self.screen.get_size(), self.build_layer, name)
+
+   def build_layer(self, name):
+       surface = pygame.Surface(self.screen.get_size()).convert()
+
+       if name == "menu":
+           surface.fill(PURPLE)
+           surface.blit(self.title_text, self.title_rect)
+           pygame.draw.rect(surface, DARKPINK, self.button_box, border_radius=10)
+           surface.blit(self.button_text, self.button_rect)
+
+       elif name == "character":
+           surface.fill(LIGHTPINK)
+           subtitle_text = self.text_cache.get(SUBTITLE, self.subtitle_font, WHITE)[0][0]
+           surface.blit(subtitle_text, subtitle_text.get_rect(center=subtitle_center))
            for i, (x, y) in enumerate(outfit_positions):
-               rect = pygame.Rect(x, y, 150, 150)
-               if rect.collidepoint(event.pos):
-                   selected_outfit = i
-           if selected_outfit is not None and char_continue_box.collidepoint(event.pos):
-               click_sound.play()
-               character_sprite = outfits[selected_outfit]
-               current_screen = "chat"
-               current_chat = 0
-               chat_state = "question"
-               selected_option = None
-
-       # Chat events
-       elif current_screen == "chat":
-           if event.type == pygame.MOUSEBUTTONDOWN and back_box.collidepoint(event.pos):
-               click_sound.play()
-               current_screen = "menu"
-           elif event.type == pygame.KEYDOWN:
-               click_sound.play()
-               if chat_state == "options":
-                   if event.key == pygame.K_1:
-                       selected_option = 0
-                       chat_state = "reply"
-                   elif event.key == pygame.K_2:
-                       selected_option = 1
-                       chat_state = "reply"
-               elif chat_state == "reply" and event.key == pygame.K_SPACE:
-                   # Launch mini-game if option 1 was selected
-                   q_text = chat_queue[current_chat][0]
-                   try:
-                       base_path = os.path.dirname(os.path.abspath(__file__))
-                       if "Trade Port" in q_text and selected_option == 0:
-                           subprocess.Popen([sys.executable, os.path.join(base_path, "FedReserveMiniGame.py")])
-                       elif "credit score" in q_text and selected_option == 0:
-                           subprocess.Popen([sys.executable, os.path.join(base_path, "CreditMiniGame.py")])
-                       elif "blockchain" in q_text and selected_option == 0:
-                           subprocess.Popen([sys.executable, os.path.join(base_path, "blockchain_game.py")])
-                   except Exception as e:
-                       print(f"Mini-game launch failed: {e}")
-
-                   current_screen = "play"
-
-       # Play screen events
-       elif current_screen == "play" and event.type == pygame.KEYDOWN:
-           if event.key == pygame.K_SPACE:
-               click_sound.play()
-               current_chat += 1
-               if current_chat >= len(chat_queue):
-                   running = False
-               else:
-                   chat_state = "question"
-                   selected_option = None
-                   current_screen = "chat"
-
-   # ---------------- Drawing ----------------
-   if current_screen == "menu":
-       screen.fill(PURPLE)
-       screen.blit(title_text, title_rect)
-       pygame.draw.rect(screen, DARKPINK, button_box, border_radius=10)
-       screen.blit(button_text, button_rect)
-
-   elif current_screen == "character":
-       screen.fill(LIGHTPINK)
-       screen.blit(subtitle_text, subtitle_rect)
-       for i, (x, y) in enumerate(outfit_positions):
-           screen.blit(outfits[i], (x, y))
-           if selected_outfit == i:
+               surface.blit(self.outfits[i], (x, y))
+           pygame.draw.rect(surface, DARKPINK, self.char_continue_box, border_radius=10)
+           surface.blit(self.char_continue_text, self.char_continue_rect)
+
+       elif name == "chat":
+           surface.fill(LIGHTPINK)
+           self.draw_chat_box(surface)
+           pygame.draw.rect(surface, DARKPINK, self.back_box, border_radius=5)
+           surface.blit(self.back_text, self.back_rect)
+
+       elif name == "loading":
+           surface.fill(PURPLE)
+           loading_text = self.text_cache.get("loading...", self.button_font, WHITE)[0][0]
+           surface.blit(loading_text, loading_text.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
+
+       elif name == "load_failed":
+           surface.fill(PURPLE)
+           for i, line in enumerate(("Sorry, this part of the game could not be loaded.",
+                                     "Press Esc to go back to the menu.")):
+               text = self.text_cache.get(line, self.button_font, WHITE)[0][0]
+               surface.blit(text, text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + (i * 2 - 1) * 24)))
+
+       return surface
+
+   def draw(self):
+       """Repaint what changed; returns the rects to push (empty: nothing to do)."""
+       if not self.screen_ready():
+           name = "load_failed" if self.screen_failed() else "loading"
+           dirty = self.renderer.dirty_rects(name, {})
+           if dirty:
+               self.screen.blit(self.static_layer(name), (0, 0))
+           return dirty
+
+       # Only repaint (and push) the regions that changed since the last frame
+       regions = self.screen_regions()
+       if self.hud.visible:
+           regions["hud"] = (self.hud.rect((WIDTH, HEIGHT)), self.hud.revision)
+       dirty = self.renderer.dirty_rects(self.current_screen, regions)
+       if not dirty:
+           return dirty
+       screen = self.screen
+       screen.set_clip(clip_union(dirty))
+
+       # Static content is one cached blit; dynamic elements go on top.
+       # The play screen instead shows the visible tiles of the world map.
+       if self.current_screen == "play":
+           self.world.draw(screen, self.camera)
+           self.crowd.draw(screen)
+       else:
+           screen.blit(self.static_layer(self.current_screen), (0, 0))
+
+       if self.current_screen == "character":
+           if self.selected_outfit is not None:
+               x, y = outfit_positions[self.selected_outfit]
+               # Preview of the composited look over the plain outfit
+               screen.fill(LIGHTPINK, (x, y, AVATAR_SIZE, AVATAR_SIZE))
+               screen.blit(self.avatars.composite(self.look), (x, y))
                pygame.draw.rect(screen, WHITE, (x-5, y-5, 160, 160), 3)
-       pygame.draw.rect(screen, DARKPINK, char_continue_box, border_radius=10)
-       screen.blit(char_continue_text, char_continue_rect)
-
-   elif current_screen == "chat":
-       screen.fill(LIGHTPINK)
-       draw_chat_box()
-       pygame.draw.rect(screen, DARKPINK, back_box, border_radius=5)
-       screen.blit(back_text, back_rect)
-       if current_chat < len(chat_queue):
-           question, options, replies = chat_queue[current_chat]
-           if chat_state == "question":
-               draw_wrapped_text(question, BOX_X + 10, BOX_Y + 10, BOX_WIDTH - 20, NAME_COLOR)
-               chat_state = "options"
-           elif chat_state == "options":
-               draw_wrapped_text(question, BOX_X + 10, BOX_Y + 10, BOX_WIDTH - 20, NAME_COLOR)
-               draw_wrapped_text("1. " + options[0], BOX_X + 10, BOX_Y + 50, BOX_WIDTH - 20)
-               draw_wrapped_text("2. " + options[1], BOX_X + 10, BOX_Y + 80, BOX_WIDTH - 20)
-           elif chat_state == "reply":
-               draw_wrapped_text(replies[selected_option], BOX_X + 10, BOX_Y + 10, BOX_WIDTH - 20)
-
-   elif current_screen == "play":
-       screen.blit(map_background, (0, 0))
-       keys = pygame.key.get_pressed()
-       if keys[pygame.K_LEFT]: char_x -= speed
-       if keys[pygame.K_RIGHT]: char_x += speed
-       if keys[pygame.K_UP]: char_y -= speed
-       if keys[pygame.K_DOWN]: char_y += speed
-
-       char_x = max(0, min(WIDTH - 150, char_x))
-       char_y = max(0, min(HEIGHT - 150, char_y))
-
-       if character_sprite:
-           screen.blit(character_sprite, (char_x, char_y))
-
-       info_text = FONT.render("Press SPACE to continue", True, WHITE)
-       screen.blit(info_text, (WIDTH // 2 - 100, HEIGHT - 50))
-
-   pygame.display.flip()
-
-pygame.quit()
-sys.exit()
-
-
-
-
+               for (layer, rect), choice in zip(layer_buttons, self.look[1:]):
+                   pygame.draw.rect(screen, DARKPINK, rect, border_radius=8)
+                   label = f"{layer}: {self.avatars.label(layer, choice)}"
+                   text = self.text_cache.get(label, self.chat_font, WHITE)[0][0]
+                   screen.blit(text, text.get_rect(center=rect.center))
+
+       elif self.current_screen == "chat":
+           if self.current_chat < len(chat_queue):
+               question, options, replies = chat_queue[self.current_chat]
+               if self.chat_state == "question":
+                   self.draw_wrapped_text(question, BOX_X + 10, BOX_Y + 10, BOX_WIDTH - 20, NAME_COLOR)
+                   self.chat_state = "options"
+               elif self.chat_state == "options":
+                   self.draw_wrapped_text(question, BOX_X + 10, BOX_Y + 10, BOX_WIDTH - 20, NAME_COLOR)
+                   self.draw_wrapped_text("1. " + options[0], BOX_X + 10, BOX_Y + 50, BOX_WIDTH - 20)
+                   self.draw_wrapped_text("2. " + options[1], BOX_X + 10, BOX_Y + 80, BOX_WIDTH - 20)
+               elif self.chat_state == "reply":
+                   self.draw_wrapped_text(replies[self.selected_option], BOX_X + 10, BOX_Y + 10, BOX_WIDTH - 20)
+
+       elif self.current_screen == "play":
+           if self.walk:
+               sheet, area = self.walk.frame()
+               screen.blit(sheet, self.walk.atlas.frame_rect(self.avatar_screen_rect().topleft), area)
+
+           # Drawn over the avatar, so not part of the static layer
+           self.text_cache.draw(screen, "Press SPACE to continue", self.chat_font, WIDTH // 2 - 100, HEIGHT - 50, WHITE)
+           summary = self.results_summary()
+           if summary:
+               self.text_cache.draw(screen, summary, self.chat_font, 10, 10, WHITE)
+
+       if self.hud.visible:
+           self.hud.draw(screen)
+       screen.set_clip(None)
+       return dirty
+
+   # ---------------------------
+   # Main loop
+   # ---------------------------
+   def step(self, events=None, keys=None, elapsed=None):
+       """Advance one frame. events/keys default to the live pygame input."""
+       # Phase timings only while the HUD is shown or logging
+       timed = self.hud.active
+       if timed:
+           t0 = time.perf_counter()
+       if events is None:
+           events = pygame.event.get()
+       self.audio.mark_input(self.input_since)
+       self.input_since = time.perf_counter()
+       if elapsed is None:
+           elapsed = 1 / FPS
+       for event in coalesce(events):
+           self.handle_event(event)
+       if timed:
+           t1 = time.perf_counter()
+
+       self.assets.poll(LOAD_BUDGET)
+       moving = self.update(pygame.key.get_pressed() if keys is None else keys, elapsed)
+       if timed:
+           t2 = time.perf_counter()
+
+       dirty = self.draw()
+       if timed:
+           t3 = time.perf_counter()
+       if dirty:
+           pygame.display.update(dirty)
+       if timed:
+           self.hud.record(elapsed, len(events), t1 - t0, t2 - t1, t3 - t2, time.perf_counter() - t3)
+
+       # Full rate while moving, loading or reacting to input, idle rate otherwise
+       self.fps = self.pacer.next_fps(moving or bool(events) or self.assets.busy, elapsed)
+       # Input for the screen the next frame shows
+       self.router.activate(self.active_screen())
+       return self.running
+
+   def wait_frame(self):
+       """Wait until the next frame is due; returns (elapsed ms, input that cut an idle wait short)."""
+       if self.fps >= FPS:
+           elapsed_ms = self.clock.tick(self.fps)
+           self.last_tick = time.perf_counter()
+           return elapsed_ms, []
+       # At the idle rate a click would otherwise sit in the queue for up to
+       # a whole idle frame; wake for it instead
+       remaining_ms = 1000 / self.fps - (time.perf_counter() - self.last_tick) * 1000
+       woken = []
+       if remaining_ms >= 1:
+           # (a timeout of 0 would mean no timeout)
+           event = pygame.event.wait(int(remaining_ms))
+           if event.type != pygame.NOEVENT:
+               self.input_since = time.perf_counter()
+               woken.append(event)
+       elapsed_ms = self.clock.tick()
+       self.last_tick = time.perf_counter()
+       return elapsed_ms, woken
+
+   def run(self, recorder=None):
+       while self.running:
+           elapsed_ms, woken = self.wait_frame()
+           events, keys = woken + pygame.event.get(), pygame.key.get_pressed()
+           if recorder is not None:
+               recorder.frame(elapsed_ms, events, keys)
+           self.step(events, keys, elapsed_ms / 1000.0)
+
+   # ---------------------------
+   # Recording
+   # ---------------------------
+   def session_setup(self):
+       """What a replay needs besides the input (see recording.py)."""
+       return {"seed": self.seed, "look": list(self.look) if self.look else None}
+
+   def apply_setup(self, setup):
+       self.assets.wait()
+       self.look = tuple(setup["look"]) if setup["look"] else None
+       self.selected_outfit = self.look[0] if self.look else None
+
+   def state_digest(self):
+       """Checksum of the state input drives, to compare a replay with its recording."""
+       state = (self.current_screen, self.current_chat, self.chat_state, self.selected_option,
+                self.look, self.pos, sorted(zone.name for zone in self.inside_zones))
+       return zlib.crc32(repr(state).encode())
+
+   def close(self):
+       if self.minigames:
+           self.minigames.close()
+       self.hud.close()
+       self.audio.close()
+       self.assets.close()
+       pygame.quit()
+
+
+def main():
+   # GAME_RECORD=<file> records the session for benchmark.py --replay
+   record_path = os.environ.get("GAME_RECORD")
+   if record_path:
+      game = HomepageGame(seed=int.from_bytes(os.urandom(4), "little"))
+      # Everything loaded up front, so a replay sees the same screens
+      game.assets.wait()
+      recorder = SessionRecorder(record_path, game.session_setup(), MOVE_KEYS)
+      try:
+         game.run(recorder)
+      finally:
+         recorder.close(game.state_digest())
+   else:
+      game = HomepageGame()
+      game.run()
+   game.close()
+   sys.exit()
+
+
+if __name__ == "__main__":
+   main()
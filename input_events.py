@@ -0,0 +1,99 @@
+"""Event filtering and dispatch for the homepage screens.
+
+EventRouter holds one handler table per screen (event type -> handler)
+plus handlers that apply on every screen. When the active screen changes
+it calls pygame.event.set_allowed() with the types those tables handle,
+plus the matching key and button releases that coalesce() relies on.
+SDL then drops everything else (mouse motion on a screen that
+ignores it, window, text and audio events) before it reaches the queue.
+Dispatch is a dict lookup instead of a chain of type and screen tests.
+
+coalesce() merges bursts within one frame's events: mouse motion to the
+last position, wheel ticks into one summed event, and presses of a key
+or button that is still down (no release between them), i.e. repeats.
+The work per frame then stays flat however much input arrives.
+"""
+
+import pygame
+
+# Releases let through with their presses, so coalesce() can tell a
+# second real press from a repeat
+_RELEASES = {pygame.KEYDOWN: pygame.KEYUP, pygame.MOUSEBUTTONDOWN: pygame.MOUSEBUTTONUP}
+
+
+def coalesce(events):
+    """events with bursts merged; order is otherwise kept."""
+    if len(events) < 2:
+        return events
+    out = []
+    motions, wheels = [], []
+    motion_index = wheel_index = 0
+    keys_down = set()
+    buttons_down = set()
+    for event in events:
+        kind = event.type
+        if kind == pygame.MOUSEMOTION:
+            if not motions:
+                motion_index = len(out)
+                out.append(event)
+            motions.append(event)
+            continue
+        if kind == pygame.MOUSEWHEEL:
+            if not wheels:
+                wheel_index = len(out)
+                out.append(event)
+            wheels.append(event)
+            continue
+        if kind == pygame.KEYDOWN:
+            if event.key in keys_down:
+                continue
+            keys_down.add(event.key)
+        elif kind == pygame.KEYUP:
+            keys_down.discard(event.key)
+        elif kind == pygame.MOUSEBUTTONDOWN:
+            press = (event.button, event.pos)
+            if press in buttons_down:
+                continue
+            buttons_down.add(press)
+        elif kind == pygame.MOUSEBUTTONUP:
+            buttons_down = {press for press in buttons_down if press[0] != event.button}
+        out.append(event)
+
+    # One motion to the latest position (rel adds up) and one wheel event
+    if len(motions) > 1:
+        last = motions[-1]
+        rel = (sum(e.rel[0] for e in motions), sum(e.rel[1] for e in motions))
+        out[motion_index] = pygame.event.Event(pygame.MOUSEMOTION, pos=last.pos, rel=rel, buttons=last.buttons)
+    if len(wheels) > 1:
+        out[wheel_index] = pygame.event.Event(pygame.MOUSEWHEEL, x=sum(e.x for e in wheels),
+                                              y=sum(e.y for e in wheels), flipped=wheels[-1].flipped)
+    return out
+
+
+class EventRouter:
+    def __init__(self, common, screens):
+        """common and each screens[name] map event type -> handler(event)."""
+        self.common = common
+        self.screens = screens
+        self.active = None
+
+    def allowed(self, screen):
+        types = self.common.keys() | self.screens.get(screen, {}).keys()
+        return sorted(types | {_RELEASES[t] for t in types if t in _RELEASES})
+
+    def activate(self, screen):
+        """Let only the event types screen handles onto the queue."""
+        if screen == self.active:
+            return
+        self.active = screen
+        if pygame.display.get_init():
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(self.allowed(screen))
+
+    def dispatch(self, screen, event):
+        handler = self.common.get(event.type)
+        if handler is not None:
+            handler(event)
+        handler = self.screens.get(screen, {}).get(event.type)
+        if handler is not None:
+            handler(event)
@@ -0,0 +1,145 @@
+"""Background asset loading.
+
+AssetLoader runs load jobs on one worker thread while the main thread
+keeps drawing frames. A job does the slow, display-independent part off
+the main thread: file IO, decoding and scaling into plain surfaces. Each
+piece it produces is handed back through a thread-safe queue together
+with a finalize function. finalize does whatever must happen on the main
+thread, above all convert()/convert_alpha(), which need the display.
+
+poll() runs queued finalize calls until a time budget is spent, and
+leaves the rest for later frames. A job that produces many pieces (e.g.
+one per map tile) therefore spreads its cost over several frames instead
+of stalling one. Jobs run in the order they were submitted, and pieces
+are finalized in the order they were produced.
+
+A job or finalize call that raises is reported back through the same
+queue: the name lands in errors instead of assets and stops counting as
+busy. load_now() is the fallback for those: it runs the failed job again
+on the calling thread, finalizing each piece straight away. Pieces of
+that job which did load the first time are kept, not finalized again.
+"""
+
+import queue
+import threading
+import time
+
+
+class AssetLoader:
+    def __init__(self):
+        self.assets = {}
+        self.errors = {}
+        self._submitted = {}  # job name -> (work, finalize)
+        self._origin = {}  # piece name -> name of the job that put it
+        self._retried = set()
+        self._jobs = queue.Queue()
+        self._done = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def submit(self, name, work, finalize=None):
+        """Run work(put) on the worker thread.
+
+        work calls put(name, payload, finalize) for every piece it makes; the
+        piece becomes self.assets[name] = finalize(payload) on the main
+        thread (payload itself if finalize is None). If work returns a value,
+        that is put under the job's own name with the job's finalize.
+        """
+        self._submitted[name] = (work, finalize)
+        with self._lock:
+            self._pending.add(name)
+        self._jobs.put((name, work, finalize))
+
+    def _put(self, job, name, payload, finalize=None):
+        self._origin[name] = job
+        with self._lock:
+            self._pending.add(name)
+        self._done.put((name, payload, finalize, None))
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            name, work, finalize = job
+            try:
+                payload = work(lambda *piece: self._put(name, *piece))
+            except Exception as e:
+                self._done.put((name, None, None, e))
+            else:
+                self._done.put((name, payload, finalize, None))
+
+    def poll(self, budget=0.004):
+        """Finalize arrived pieces for up to budget seconds; True if any were."""
+        if self._done.empty():
+            return False
+        deadline = time.perf_counter() + budget
+        finished = False
+        while True:
+            try:
+                name, payload, finalize, error = self._done.get_nowait()
+            except queue.Empty:
+                return finished
+            if error is None and (payload is not None or finalize is not None):
+                try:
+                    self.assets[name] = finalize(payload) if finalize else payload
+                except Exception as e:
+                    error = e
+            if error is not None:
+                print(f"Loading {name} failed: {error}")
+                self.errors[name] = error
+            with self._lock:
+                self._pending.discard(name)
+            finished = True
+            if time.perf_counter() >= deadline:
+                return finished
+
+    def ready(self, *names):
+        return all(name in self.assets for name in names)
+
+    def failed(self, *names):
+        """Those of names whose job or finalize raised."""
+        return [name for name in names if name in self.errors]
+
+    def load_now(self, *names):
+        """Run the jobs behind failed names again, here and now; True if all loaded.
+
+        Each job is retried once; after that its error stands.
+        """
+        jobs = {self._origin.get(name, name) for name in self.failed(*names)}
+        for job in jobs - self._retried:
+            self._retried.add(job)
+            work, finalize = self._submitted[job]
+
+            def put(name, payload, finalize=None):
+                if name in self.assets:
+                    return  # loaded fine the first time; finalizing again could repeat side effects
+                self.assets[name] = finalize(payload) if finalize else payload
+                self.errors.pop(name, None)
+
+            try:
+                payload = work(put)
+                if payload is not None or finalize is not None:
+                    put(job, payload, finalize)
+            except Exception as e:
+                print(f"Loading {job} failed again: {e}")
+                self.errors[job] = e
+        return not self.failed(*names)
+
+    @property
+    def busy(self):
+        with self._lock:
+            return bool(self._pending)
+
+    def wait(self, timeout=30.0):
+        """Block until every submitted job is loaded and finalized."""
+        deadline = time.perf_counter() + timeout
+        while self.busy and time.perf_counter() < deadline:
+            if not self.poll(budget=timeout):
+                time.sleep(0.001)
+
+    def close(self):
+        self._jobs.put(None)
+        self._thread.join(timeout=2.0)
@@ -0,0 +1,250 @@
+"""Long-lived host process for the tkinter mini-games.
+
+Starting a mini-game with a fresh interpreter means importing tkinter and
+creating a Tk root every time, which takes seconds on slow machines. The
+homepage instead starts this script in the background when the menu
+appears. It imports the mini-game modules, creates one hidden Tk root and
+then waits for JSON commands on stdin, one per line:
+
+    {"cmd": "open", "game": "fed"}
+    {"cmd": "quit"}
+
+Each "open" shows the game as a Toplevel of the shared root, so the window
+is usable almost immediately. After "quit", or when stdin is closed (the
+homepage went away), the host exits once its open games are closed.
+
+Outcomes come back the other way: every game's on_result callback writes
+one JSON object per line to the host's stdout, e.g.
+
+    {"game": "credit", "won": true, "score": 761, "months_used": 7, ...}
+
+When a game's window closes the host also writes
+
+    {"game": "credit", "closed": true}
+
+Anything else a game prints is sent to stderr so it cannot corrupt that
+stream.
+
+MiniGameLauncher is the homepage side. A daemon thread reads result lines
+into a queue and poll_results() drains it without blocking, so the pygame
+loop can check for outcomes every frame. The close notices are consumed
+there too: they keep is_open() current, so the homepage does not open a
+second window of a game that is still up. If the host is not running or its
+pipe breaks, it is restarted before sending the command. If it still
+cannot take the command, the game script is started directly instead, as
+before the host existed (slower, and that game's outcome is not
+reported), so a broken host never stops a mini-game from opening.
+
+Run standalone for debugging: python3 minigame_host.py
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HOST_SCRIPT = os.path.abspath(__file__)
+
+MINIGAMES = ("fed", "credit", "blockchain")
+# Standalone scripts, for when the host cannot open a game
+MINIGAME_SCRIPTS = {
+    "fed": "FedReserveMiniGame.py",
+    "credit": "CreditMiniGame.py",
+    "blockchain": "blockchain_game.py",
+}
+
+POLL_MS = 30
+
+
+# ---------------------------
+# Host process
+# ---------------------------
+def _center(window):
+    window.update_idletasks()
+    w = window.winfo_width()
+    h = window.winfo_height()
+    x = (window.winfo_screenwidth() // 2) - (w // 2)
+    y = (window.winfo_screenheight() // 2) - (h // 2)
+    window.geometry(f"{w}x{h}+{x}+{y}")
+
+
+def _open_game(root, game, on_result=None, on_closed=None):
+    from FedReserveMiniGame import FedMiniGame
+    from CreditMiniGame import CreditScoreGame
+    from blockchain_game import BlockchainGame
+
+    if game == "fed":
+        window = FedMiniGame(root, on_result=on_result).popup
+    elif game == "credit":
+        window = CreditScoreGame(root, on_result=on_result).root
+    elif game == "blockchain":
+        window = BlockchainGame(root, on_result=on_result).root
+    else:
+        raise ValueError(f"unknown mini-game {game!r}")
+    if on_closed:
+        # <Destroy> reaches the window's binding for every child too
+        window.bind("<Destroy>", lambda event: event.widget is window and on_closed(game), add="+")
+    _center(window)
+    window.lift()
+    window.focus_force()
+
+
+def _read_commands(stream, commands):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            commands.put(json.loads(line))
+        except ValueError:
+            print(f"minigame host: bad command {line!r}", file=sys.stderr)
+    commands.put(None)  # EOF: the homepage closed the pipe
+
+
+def serve(stream=None, results=None):
+    import tkinter as tk
+    # Imported up front so opening a game later costs no module loading
+    import FedReserveMiniGame  # noqa: F401
+    import CreditMiniGame  # noqa: F401
+    import blockchain_game  # noqa: F401
+
+    # stdout is the result channel; keep stray prints off it
+    results = results or sys.stdout
+    sys.stdout = sys.stderr
+
+    def report(payload):
+        try:
+            results.write(json.dumps(payload) + "\n")
+            results.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            pass
+
+    root = tk.Tk()
+    root.withdraw()
+
+    commands = queue.Queue()
+    reader = threading.Thread(target=_read_commands, args=(stream or sys.stdin, commands), daemon=True)
+    reader.start()
+
+    quitting = False
+
+    def poll():
+        nonlocal quitting
+        while True:
+            try:
+                command = commands.get_nowait()
+            except queue.Empty:
+                break
+            if command is None or command.get("cmd") == "quit":
+                quitting = True
+            elif command.get("cmd") == "open":
+                try:
+                    _open_game(root, command.get("game"), report,
+                               lambda game: report({"game": game, "closed": True}))
+                except Exception as e:
+                    print(f"minigame host: could not open {command.get('game')!r}: {e}", file=sys.stderr)
+        # Games still open when the homepage exits stay up until closed
+        if quitting and not root.winfo_children():
+            root.destroy()
+            return
+        root.after(POLL_MS, poll)
+
+    poll()
+    root.mainloop()
+
+
+# ---------------------------
+# Homepage side
+# ---------------------------
+class MiniGameLauncher:
+    def __init__(self, base_path=BASE_DIR):
+        self.base_path = base_path
+        self._proc = None
+        self._results = queue.Queue()
+        self._open = {}  # game -> the process showing its window
+
+    def start(self):
+        """Start the host in the background; returns immediately."""
+        if self.host_alive():
+            return
+        try:
+            self._proc = subprocess.Popen([sys.executable, HOST_SCRIPT],
+                                          stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                          text=True, cwd=self.base_path)
+        except OSError as e:
+            print(f"Mini-game host failed to start: {e}")
+            self._proc = None
+            return
+        reader = threading.Thread(target=self._read_results, args=(self._proc.stdout,), daemon=True)
+        reader.start()
+
+    def _read_results(self, stream):
+        for line in stream:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(result, dict):
+                self._results.put(result)
+
+    def poll_results(self):
+        """Results reported since the last call; never blocks."""
+        results = []
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return results
+            if result.get("closed"):
+                self._open.pop(result.get("game"), None)
+            else:
+                results.append(result)
+
+    def is_open(self, game):
+        """Whether a window of game is up, as of the last poll_results()."""
+        proc = self._open.get(game)
+        # A process that has gone took its windows with it
+        return proc is not None and proc.poll() is None
+
+    def host_alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def _send(self, command):
+        self._proc.stdin.write(json.dumps(command) + "\n")
+        self._proc.stdin.flush()
+
+    def launch(self, game):
+        if game not in MINIGAMES:
+            raise ValueError(f"unknown mini-game {game!r}")
+        for _ in range(2):
+            if not self.host_alive():
+                # Cold start: same cost as launching the game script itself
+                self.start()
+            if self._proc is None:
+                break
+            try:
+                self._send({"cmd": "open", "game": game})
+                self._open[game] = self._proc
+                return
+            except (BrokenPipeError, OSError):
+                self._proc = None
+        # No usable host: cold start the game on its own
+        print(f"Mini-game host unavailable; starting {MINIGAME_SCRIPTS[game]} directly")
+        script = os.path.join(self.base_path, MINIGAME_SCRIPTS[game])
+        self._open[game] = subprocess.Popen([sys.executable, script], cwd=self.base_path)
+
+    def close(self):
+        if not self.host_alive():
+            return
+        try:
+            self._send({"cmd": "quit"})
+            self._proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+
+if __name__ == "__main__":
+    serve()
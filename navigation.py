@@ -0,0 +1,242 @@
+"""Click-to-move navigation for the world map.
+
+NavGrid is a coarse walkability grid over the world: a cell is walkable
+if the avatar's feet can stand at its centre. Building it means testing
+every cell against the obstacle zones, so the result is stored in
+CACHE_DIR keyed by everything it depends on and simply read back on
+later runs.
+
+PathPlanner runs A* on the grid incrementally: each call to step()
+expands at most a fixed number of nodes, so a long search is spread over
+several frames instead of causing a hitch. Finished paths are smoothed
+by dropping waypoints that have a clear straight line past them. When
+the target changes, the search restarts from the current position while
+the avatar keeps following the previous path until the new one is ready.
+"""
+
+import hashlib
+import heapq
+import math
+import os
+import struct
+
+from assets import CACHE_DIR
+
+_MAGIC = b"GHNV"
+_HEADER = struct.Struct("<4sHHH")  # magic, cols, rows, cell size
+
+_NEIGHBOURS = [(1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+               (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2))]
+
+
+class NavGrid:
+    def __init__(self, cols, rows, cell_size, cells):
+        self.cols = cols
+        self.rows = rows
+        self.cell_size = cell_size
+        self.cells = cells  # bytearray, 1 = walkable, row-major
+
+    @classmethod
+    def build(cls, world_size, cell_size, is_walkable):
+        """Grid for world_size; is_walkable(x, y) is asked for every cell centre."""
+        cols = -(-world_size[0] // cell_size)
+        rows = -(-world_size[1] // cell_size)
+        cells = bytearray(cols * rows)
+        half = cell_size // 2
+        for row in range(rows):
+            for col in range(cols):
+                if is_walkable(col * cell_size + half, row * cell_size + half):
+                    cells[row * cols + col] = 1
+        return cls(cols, rows, cell_size, cells)
+
+    @staticmethod
+    def _cache_path(key, world_size, cell_size, cache_dir):
+        digest = hashlib.sha1(repr((key, tuple(world_size), cell_size)).encode()).hexdigest()[:16]
+        return os.path.join(cache_dir, f"navgrid-{digest}.raw")
+
+    @classmethod
+    def load(cls, key, world_size, cell_size, cache_dir=CACHE_DIR):
+        """The grid cached under key, or None if there is none yet."""
+        grid = cls._read(cls._cache_path(key, world_size, cell_size, cache_dir))
+        if grid is None or grid.cell_size != cell_size:
+            return None
+        return grid
+
+    @classmethod
+    def load_or_build(cls, key, world_size, cell_size, is_walkable, cache_dir=CACHE_DIR):
+        """Read the grid cached under key, or build and cache it."""
+        grid = cls.load(key, world_size, cell_size, cache_dir)
+        if grid is None:
+            grid = cls.build(world_size, cell_size, is_walkable)
+            grid._write(cls._cache_path(key, world_size, cell_size, cache_dir))
+        return grid
+
+    @classmethod
+    def _read(cls, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        magic, cols, rows, cell_size = _HEADER.unpack_from(data)
+        cells = bytearray(data[_HEADER.size:])
+        if magic != _MAGIC or len(cells) != cols * rows:
+            return None
+        return cls(cols, rows, cell_size, cells)
+
+    def _write(self, path):
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, self.cols, self.rows, self.cell_size))
+                f.write(bytes(self.cells))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def walkable(self, col, row):
+        return 0 <= col < self.cols and 0 <= row < self.rows and self.cells[row * self.cols + col] == 1
+
+    def cell_of(self, pos):
+        return int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)
+
+    def center(self, cell):
+        half = self.cell_size / 2
+        return cell[0] * self.cell_size + half, cell[1] * self.cell_size + half
+
+    def nearest_walkable(self, cell, max_radius=8):
+        """cell itself if walkable, else the closest walkable cell in a ring search."""
+        col, row = cell
+        if self.walkable(col, row):
+            return cell
+        for radius in range(1, max_radius + 1):
+            best = None
+            for dc in range(-radius, radius + 1):
+                for dr in (-radius, radius) if abs(dc) != radius else range(-radius, radius + 1):
+                    if self.walkable(col + dc, row + dr):
+                        d = dc * dc + dr * dr
+                        if best is None or d < best[0]:
+                            best = (d, (col + dc, row + dr))
+            if best:
+                return best[1]
+        return None
+
+    def line_clear(self, a, b):
+        """True if the straight segment a-b (world points) only crosses walkable cells."""
+        dist = math.hypot(b[0] - a[0], b[1] - a[1])
+        steps = max(1, int(dist / (self.cell_size / 2)))
+        for i in range(steps + 1):
+            t = i / steps
+            if not self.walkable(*self.cell_of((a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t))):
+                return False
+        return True
+
+
+class PathPlanner:
+    def __init__(self, grid, nodes_per_step=400):
+        self.grid = grid
+        self.nodes_per_step = nodes_per_step
+        self.status = "idle"  # idle, searching, found, failed
+        self.goal_point = None
+        self.path = []  # smoothed world points still to visit
+        self._search = None
+
+    def request(self, start_point, goal_point):
+        """Plan from start_point to goal_point; replaces any earlier target."""
+        grid = self.grid
+        start = grid.nearest_walkable(grid.cell_of(start_point))
+        goal = grid.nearest_walkable(grid.cell_of(goal_point))
+        if start is None or goal is None:
+            self._fail()
+            return
+        self.goal_point = goal_point if grid.walkable(*grid.cell_of(goal_point)) else grid.center(goal)
+        self._search = {
+            "start": start,
+            "start_point": start_point,
+            "goal": goal,
+            "open": [(self._h(start, goal), 0, start)],
+            "g": {start: 0.0},
+            "came_from": {},
+            "closed": set(),
+            "counter": 1,
+        }
+        self.status = "searching"
+
+    def _fail(self):
+        self.status = "failed"
+        self._search = None
+        self.path = []
+
+    def cancel(self):
+        self._search = None
+        self.path = []
+        self.status = "idle"
+
+    @staticmethod
+    def _h(a, b):
+        dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+        return (dx + dy) + (math.sqrt(2) - 2) * min(dx, dy)
+
+    def step(self, budget=None):
+        """Expand up to budget nodes of the current search; returns status."""
+        search = self._search
+        if search is None:
+            return self.status
+        grid = self.grid
+        open_heap, g, came_from, goal = search["open"], search["g"], search["came_from"], search["goal"]
+        closed = search["closed"]
+        for _ in range(budget or self.nodes_per_step):
+            if not open_heap:
+                self._fail()
+                return self.status
+            _, _, cell = heapq.heappop(open_heap)
+            if cell in closed:
+                continue
+            closed.add(cell)
+            if cell == goal:
+                self.path = self._finish(search)
+                self.status = "found"
+                self._search = None
+                return self.status
+            col, row = cell
+            base = g[cell]
+            for dc, dr, cost in _NEIGHBOURS:
+                nc, nr = col + dc, row + dr
+                if not grid.walkable(nc, nr):
+                    continue
+                # No cutting corners past a blocked cell
+                if dc and dr and not (grid.walkable(col + dc, row) and grid.walkable(col, row + dr)):
+                    continue
+                new_g = base + cost
+                neighbour = (nc, nr)
+                if new_g < g.get(neighbour, math.inf):
+                    g[neighbour] = new_g
+                    came_from[neighbour] = cell
+                    search["counter"] += 1
+                    heapq.heappush(open_heap, (new_g + self._h(neighbour, goal), search["counter"], neighbour))
+        return self.status
+
+    def _finish(self, search):
+        cells = [search["goal"]]
+        came_from = search["came_from"]
+        while cells[-1] != search["start"]:
+            cells.append(came_from[cells[-1]])
+        cells.reverse()
+        points = [search["start_point"]] + [self.grid.center(c) for c in cells[1:-1]] + [self.goal_point]
+        return self.smooth(points)[1:]
+
+    def smooth(self, points):
+        """Drop waypoints that a straight line from the previous kept one can skip."""
+        if len(points) <= 2:
+            return points
+        result = [points[0]]
+        anchor = 0
+        for k in range(2, len(points)):
+            if not self.grid.line_clear(points[anchor], points[k]):
+                anchor = k - 1
+                result.append(points[anchor])
+        result.append(points[-1])
+        return result
@@ -0,0 +1,138 @@
+"""Wandering NPCs (other students, mentors) on the world map.
+
+NPCCrowd keeps its entities in parallel array columns instead of one
+object per NPC: x, y, velocity, a think timer and a sprite index. Every
+frame all NPCs are moved, but the wander "AI" (picking a new heading and
+pause) only runs for one batch of them, round robin, so its cost is
+spread evenly over frames. Drawing culls against the camera and hands
+the visible ones to a single Surface.blits() call.
+
+NPCs spawn and stay on cells that the NavGrid marks walkable; one that
+would step off turns around and rethinks on its next batch.
+"""
+
+import math
+import random
+from array import array
+
+
+class NPCCrowd:
+    def __init__(self, sprites, world_size, nav_grid=None, speed=60.0, batch_size=128, seed=None):
+        self.sprites = sprites
+        self.world_size = world_size
+        self.nav_grid = nav_grid
+        self.speed = speed
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        # Sprites are drawn centred horizontally on x, with feet at y
+        self.offsets = [(-s.get_width() // 2, -s.get_height()) for s in sprites]
+        self.max_w = max(s.get_width() for s in sprites)
+        self.max_h = max(s.get_height() for s in sprites)
+
+        self.x = array("f")
+        self.y = array("f")
+        self.vx = array("f")
+        self.vy = array("f")
+        self.timer = array("f")
+        self.sprite = array("B")
+        self._next_batch = 0
+        self.visible = []
+
+    def __len__(self):
+        return len(self.x)
+
+    def _walkable(self, x, y):
+        if not (0 <= x < self.world_size[0] and 0 <= y < self.world_size[1]):
+            return False
+        grid = self.nav_grid
+        return grid is None or grid.walkable(*grid.cell_of((x, y)))
+
+    def spawn(self, count, sprite_weights=None):
+        rng = self.rng
+        indices = range(len(self.sprites))
+        for _ in range(count):
+            for _attempt in range(50):
+                x = rng.uniform(0, self.world_size[0])
+                y = rng.uniform(0, self.world_size[1])
+                if self._walkable(x, y):
+                    break
+            else:
+                # Unlucky sampling: take the closest walkable cell, or leave
+                # this NPC out rather than stranding it inside an obstacle
+                grid = self.nav_grid
+                cell = grid.nearest_walkable(grid.cell_of((x, y))) if grid else None
+                if cell is None:
+                    continue
+                x, y = grid.center(cell)
+            self.x.append(x)
+            self.y.append(y)
+            self.vx.append(0.0)
+            self.vy.append(0.0)
+            self.timer.append(rng.uniform(0.0, 2.0))
+            self.sprite.append(rng.choices(indices, sprite_weights)[0])
+
+    def _think(self, i):
+        # Either stand still for a moment or walk in a random direction
+        rng = self.rng
+        if rng.random() < 0.3:
+            self.vx[i] = self.vy[i] = 0.0
+            self.timer[i] = rng.uniform(1.0, 3.0)
+        else:
+            angle = rng.uniform(0.0, 2 * math.pi)
+            self.vx[i] = math.cos(angle) * self.speed
+            self.vy[i] = math.sin(angle) * self.speed
+            self.timer[i] = rng.uniform(1.5, 4.0)
+
+    def update(self, dt):
+        n = len(self.x)
+        if not n:
+            return
+        x, y, vx, vy, timer = self.x, self.y, self.vx, self.vy, self.timer
+
+        # AI for one batch only; the timers it checks tick down meanwhile
+        start = self._next_batch
+        end = min(n, start + self.batch_size)
+        for i in range(start, end):
+            if timer[i] <= 0.0:
+                self._think(i)
+        self._next_batch = 0 if end >= n else end
+
+        walkable = self._walkable
+        for i in range(n):
+            timer[i] -= dt
+            if vx[i] or vy[i]:
+                nx = x[i] + vx[i] * dt
+                ny = y[i] + vy[i] * dt
+                if walkable(nx, ny):
+                    x[i] = nx
+                    y[i] = ny
+                else:
+                    vx[i] = -vx[i]
+                    vy[i] = -vy[i]
+                    timer[i] = 0.0
+
+    def cull(self, camera):
+        """Blit list for the NPCs inside camera, back to front; also kept in self.visible."""
+        view = camera.rect
+        left = view.left - self.max_w // 2
+        right = view.right + self.max_w // 2
+        top = view.top
+        bottom = view.bottom + self.max_h
+        vx0, vy0 = view.x, view.y
+        x, y, sprite, offsets, sprites = self.x, self.y, self.sprite, self.offsets, self.sprites
+
+        visible = []
+        for i in range(len(x)):
+            xi = x[i]
+            yi = y[i]
+            if left <= xi < right and top <= yi < bottom:
+                s = sprite[i]
+                ox, oy = offsets[s]
+                visible.append((int(yi), sprites[s], (int(xi) + ox - vx0, int(yi) + oy - vy0)))
+        visible.sort(key=lambda item: item[0])
+        self.visible = [(surf, pos) for _, surf, pos in visible]
+        return self.visible
+
+    def draw(self, surface):
+        """Blit the NPCs found by the last cull()."""
+        surface.blits(self.visible, False)
@@ -0,0 +1,129 @@
+"""Performance overlay and timing log for the homepage.
+
+PerfHUD collects per-frame timings for the phases of a step: event
+handling, update, draw and flip. It also records how many events were
+waiting in the queue that frame. When visible it draws a small panel
+with the FPS, a sparkline of recent frame times, the mean time per phase
+and the hit rates of the surface caches. The panel is re-rendered a few
+times per second and is a single blit in between.
+
+With a log path set, every frame's timings are also written, one line
+each, to a size-capped rotating log file. That works even with the
+overlay hidden.
+
+Collection only happens while the HUD is active (visible or logging).
+When it is off, the only cost to the frame loop is reading .active once
+per frame and a few untaken branches.
+"""
+
+import logging
+import logging.handlers
+import time
+from collections import deque
+
+import pygame
+
+PHASES = ("events", "update", "draw", "flip")
+
+PANEL_SIZE = (300, 118)
+SPARK_HEIGHT = 30
+REFRESH = 0.25  # seconds between panel re-renders
+
+
+class PerfHUD:
+    def __init__(self, visible=False, log_path=None, history=120, stats=None,
+                 budget_ms=1000.0 / 60, log_bytes=1024 * 1024):
+        """stats() returns {cache name: (hits, misses)} for the hit-rate line."""
+        self.visible = visible
+        self.history = history
+        self.stats = stats
+        self.budget_ms = budget_ms
+        self.frames = deque(maxlen=history)  # (elapsed, phase ms..., queue length)
+        self.revision = 0
+        self._font = None
+        self._panel = None
+        self._last_refresh = 0.0
+
+        self.log = None
+        if log_path:
+            self.log = logging.getLogger("homepage.perf")
+            self.log.propagate = False
+            self.log.setLevel(logging.INFO)
+            handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=log_bytes, backupCount=1)
+            handler.setFormatter(logging.Formatter("%(created).3f %(message)s"))
+            self.log.addHandler(handler)
+            self.log.info("elapsed_ms " + " ".join(f"{p}_ms" for p in PHASES) + " queue")
+
+    @property
+    def active(self):
+        return self.visible or self.log is not None
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def record(self, elapsed, queue_length, *phase_seconds):
+        ms = tuple(s * 1000.0 for s in phase_seconds)
+        self.frames.append((elapsed * 1000.0,) + ms + (queue_length,))
+        if self.log is not None:
+            self.log.info(f"{elapsed * 1000.0:.2f} " + " ".join(f"{v:.3f}" for v in ms) + f" {queue_length}")
+        now = time.perf_counter()
+        if self.visible and now - self._last_refresh >= REFRESH:
+            self._last_refresh = now
+            self._panel = None
+            self.revision += 1
+
+    # ---------------------------
+    # Overlay
+    # ---------------------------
+    def rect(self, screen_size):
+        return pygame.Rect(screen_size[0] - PANEL_SIZE[0] - 10, 10, *PANEL_SIZE)
+
+    def draw(self, surface):
+        if self._panel is None:
+            self._panel = self._render()
+        surface.blit(self._panel, self.rect(surface.get_size()))
+
+    def _render(self):
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+        panel = pygame.Surface(PANEL_SIZE, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        frames = list(self.frames)
+        if not frames:
+            return panel
+
+        n = len(frames)
+        elapsed = sum(f[0] for f in frames) / n
+        phases = [sum(f[1 + i] for f in frames) / n for i in range(len(PHASES))]
+        work = [sum(f[1:1 + len(PHASES)]) for f in frames]
+        lines = [
+            f"{1000.0 / elapsed if elapsed else 0:.1f} FPS   frame {sum(phases):.2f} ms (max {max(work):.2f})",
+            "  ".join(f"{p} {v:.2f}" for p, v in zip(PHASES, phases)),
+            f"event queue {frames[-1][-1]}  (max {max(f[-1] for f in frames)})",
+        ]
+        if self.stats:
+            rates = []
+            for name, (hits, misses) in self.stats().items():
+                total = hits + misses
+                rates.append(f"{name} {100.0 * hits / total:.0f}%" if total else f"{name} -")
+            lines.append("hits: " + "  ".join(rates))
+        for i, line in enumerate(lines):
+            panel.blit(self._font.render(line, True, (255, 255, 255)), (6, 5 + i * 16))
+
+        # Sparkline of work per frame; the line marks the frame budget
+        top = PANEL_SIZE[1] - SPARK_HEIGHT - 5
+        scale = SPARK_HEIGHT / max(self.budget_ms * 1.5, max(work))
+        budget_y = top + SPARK_HEIGHT - round(self.budget_ms * scale)
+        pygame.draw.line(panel, (250, 123, 174), (6, budget_y), (PANEL_SIZE[0] - 6, budget_y))
+        step = (PANEL_SIZE[0] - 12) / max(1, self.history - 1)
+        points = [(6 + i * step, top + SPARK_HEIGHT - w * scale) for i, w in enumerate(work)]
+        if len(points) > 1:
+            pygame.draw.lines(panel, (255, 255, 0), False, points)
+        return panel
+
+    def close(self):
+        if self.log is not None:
+            for handler in list(self.log.handlers):
+                handler.close()
+                self.log.removeHandler(handler)
+            self.log = None
@@ -0,0 +1,138 @@
+"""Record a homepage session's input and read it back for replay.
+
+A recording stores, for every frame: the elapsed milliseconds the frame
+loop passed to step(), which of the tracked keys were held, and the
+input events the homepage reacts to. Together with the setup (the NPC
+random seed, and the saved avatar look the session started with), that
+is everything step() depends on. Replaying the frames through step()
+therefore walks the game through the same states.
+
+The file is gzip-compressed binary:
+
+    header   b"GHRP", version, setup JSON (u32 length + bytes),
+             tracked key codes (u8 count + u32 each)
+    frame    elapsed ms (u16), held keys bitmask (u32), event count (u16),
+             then each event: type (u16) and its fields (see _FIELDS)
+    trailer  0xFFFF in place of the elapsed ms, then a u32 digest of the
+             final game state, so a replay can check it ended in the same place
+
+Mini-game outcomes arrive from another process and are not recorded;
+see benchmark.py --replay for playing a recording back.
+"""
+
+import gzip
+import json
+import struct
+
+import pygame
+
+_MAGIC = b"GHRP"
+_VERSION = 1
+_FRAME = struct.Struct("<HIH")
+_END = 0xFFFF
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+# Event fields kept per type; "text" is a u8-length utf-8 string
+_FIELDS = {
+    pygame.QUIT: (),
+    pygame.VIDEOEXPOSE: (),
+    pygame.WINDOWEXPOSED: (),
+    pygame.KEYDOWN: (("key", "I"), ("mod", "H"), ("scancode", "H"), ("unicode", "text")),
+    pygame.KEYUP: (("key", "I"), ("mod", "H"), ("scancode", "H"), ("unicode", "text")),
+    pygame.MOUSEBUTTONDOWN: (("pos", "hh"), ("button", "B")),
+    pygame.MOUSEBUTTONUP: (("pos", "hh"), ("button", "B")),
+    pygame.MOUSEMOTION: (("pos", "hh"), ("rel", "hh"), ("buttons", "BBB")),
+}
+_STRUCTS = {fmt: struct.Struct("<" + fmt) for fields in _FIELDS.values() for _, fmt in fields if fmt != "text"}
+
+
+class KeyState:
+    """Stands in for pygame.key.get_pressed() with a set of held keys."""
+
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class SessionRecorder:
+    def __init__(self, path, setup, keys):
+        """setup is a JSON-able dict; keys are the key codes to track (at most 32)."""
+        self.keys = tuple(keys)
+        self.frames = 0
+        self._file = gzip.open(path, "wb")
+        self._file.write(_MAGIC + bytes([_VERSION]))
+        blob = json.dumps(setup).encode()
+        self._file.write(_U32.pack(len(blob)) + blob)
+        self._file.write(bytes([len(self.keys)]) + b"".join(_U32.pack(k) for k in self.keys))
+
+    def frame(self, elapsed_ms, events, pressed):
+        recorded = [e for e in events if e.type in _FIELDS]
+        mask = 0
+        for bit, key in enumerate(self.keys):
+            if pressed[key]:
+                mask |= 1 << bit
+        out = [_FRAME.pack(min(int(elapsed_ms), _END - 1), mask, len(recorded))]
+        for event in recorded:
+            out.append(_U16.pack(event.type))
+            for name, fmt in _FIELDS[event.type]:
+                value = getattr(event, name)
+                if fmt == "text":
+                    data = value.encode("utf-8")[:255]
+                    out.append(bytes([len(data)]) + data)
+                else:
+                    out.append(_STRUCTS[fmt].pack(*(value if len(fmt) > 1 else (value,))))
+        self._file.write(b"".join(out))
+        self.frames += 1
+
+    def close(self, digest=0):
+        if self._file is None:
+            return
+        self._file.write(_U16.pack(_END) + _U32.pack(digest))
+        self._file.close()
+        self._file = None
+
+
+def read_session(path):
+    """(setup, frames, digest); frames is a list of (elapsed ms, KeyState, events)."""
+    with gzip.open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != _MAGIC or data[4] != _VERSION:
+        raise ValueError(f"{path} is not a version {_VERSION} session recording")
+    offset = 5
+    (length,) = _U32.unpack_from(data, offset)
+    offset += 4
+    setup = json.loads(data[offset:offset + length])
+    offset += length
+    count = data[offset]
+    keys = struct.unpack_from(f"<{count}I", data, offset + 1)
+    offset += 1 + 4 * count
+
+    frames, digest = [], None
+    while offset < len(data):
+        (elapsed_ms,) = _U16.unpack_from(data, offset)
+        if elapsed_ms == _END:
+            (digest,) = _U32.unpack_from(data, offset + 2)
+            break
+        _, mask, n = _FRAME.unpack_from(data, offset)
+        offset += _FRAME.size
+        events = []
+        for _ in range(n):
+            (event_type,) = _U16.unpack_from(data, offset)
+            offset += _U16.size
+            attrs = {}
+            for name, fmt in _FIELDS[event_type]:
+                if fmt == "text":
+                    size = data[offset]
+                    attrs[name] = data[offset + 1:offset + 1 + size].decode("utf-8", "ignore")
+                    offset += 1 + size
+                else:
+                    values = _STRUCTS[fmt].unpack_from(data, offset)
+                    attrs[name] = values if len(fmt) > 1 else values[0]
+                    offset += _STRUCTS[fmt].size
+            events.append(pygame.event.Event(event_type, attrs))
+        held = [key for bit, key in enumerate(keys) if mask & (1 << bit)]
+        frames.append((elapsed_ms, KeyState(held), events))
+    return setup, frames, digest
@@ -0,0 +1,117 @@
+"""Surface caches shared by the homepage screens.
+
+TextCache keeps word-wrapped, pre-rendered text so that drawing an
+unchanged dialogue line is only a couple of blits instead of a split,
+several font measurements and a render per line every frame.
+
+LayerCache keeps one pre-composed surface per screen for everything that
+does not change from frame to frame (fills, buttons, titles, images), so
+a repaint starts with a single blit.
+"""
+
+from collections import OrderedDict
+
+
+def surface_bytes(surface):
+    """Approximate memory held by a surface's pixel buffer."""
+    w, h = surface.get_size()
+    return w * h * surface.get_bytesize()
+
+
+def wrap_text(text, font, max_width):
+    """Split text into lines that fit max_width (None means a single line)."""
+    if max_width is None:
+        return [text]
+    lines, current_line = [], ""
+    for word in text.split(' '):
+        test_line = current_line + word + " "
+        if font.size(test_line)[0] <= max_width:
+            current_line = test_line
+        else:
+            lines.append(current_line)
+            current_line = word + " "
+    lines.append(current_line)
+    return lines
+
+
+class TextCache:
+    """LRU cache of rendered text keyed by (text, font, color, max_width, line_height).
+
+    Each entry is a list of (surface, (dx, dy)) pairs ready for Surface.blits.
+    Entries are evicted least-recently-used first once either max_entries or
+    max_bytes is exceeded.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def get(self, text, font, color, max_width=None, line_height=25):
+        key = (text, font, tuple(color), max_width, line_height)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        lines = []
+        for i, line in enumerate(wrap_text(text, font, max_width)):
+            lines.append((font.render(line, True, color), (0, i * line_height)))
+        size = sum(surface_bytes(surf) for surf, _ in lines)
+        self._entries[key] = (lines, size)
+        self.bytes_used += size
+        self._evict()
+        return lines
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the cap
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries
+                                          or self.bytes_used > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes_used -= size
+
+    def draw(self, target, text, font, x, y, color, max_width=None, line_height=25):
+        """Blit cached text onto target with its top-left corner at (x, y)."""
+        lines = self.get(text, font, color, max_width, line_height)
+        target.blits([(surf, (x + dx, y + dy)) for surf, (dx, dy) in lines], False)
+
+
+class LayerCache:
+    """Static layers by name, rebuilt only when the layer's key changes.
+
+    The key should capture every input the layer depends on (window size,
+    a chosen outfit, ...); build(*args) returns the new surface.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.builds = 0
+        self._layers = {}
+
+    def get(self, name, key, build, *args):
+        entry = self._layers.get(name)
+        if entry is None or entry[0] != key:
+            self.builds += 1
+            entry = (key, build(*args))
+            self._layers[name] = entry
+        else:
+            self.hits += 1
+        return entry[1]
+
+    def invalidate(self, name=None):
+        if name is None:
+            self._layers.clear()
+        else:
+            self._layers.pop(name, None)
@@ -0,0 +1,140 @@
+"""Trigger zones and obstacles on the world map.
+
+Zones are kept in a SpatialHash, a uniform grid of cells, so a collision
+check only looks at the zones registered in the cells the avatar
+overlaps; the cost stays the same however many zones the map has.
+
+A Zone is a rectangle, optionally refined by a pixel mask covering that
+rectangle. color_mask_zones() derives such masks from a layer of the
+TiledMap (e.g. every water-coloured pixel), one zone per tile. Masks are
+built the first time something comes near the tile, by default from the
+tile that is already loaded for drawing.
+"""
+
+from collections import defaultdict
+
+import pygame
+
+
+class SpatialHash:
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self._cells = defaultdict(list)
+        self._item_cells = {}
+
+    def _cell_keys(self, rect):
+        cs = self.cell_size
+        x0, y0 = rect.left // cs, rect.top // cs
+        x1, y1 = (rect.right - 1) // cs, (rect.bottom - 1) // cs
+        return [(cx, cy) for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)]
+
+    def insert(self, item, rect):
+        keys = self._cell_keys(pygame.Rect(rect))
+        for key in keys:
+            self._cells[key].append(item)
+        self._item_cells[item] = keys
+
+    def remove(self, item):
+        for key in self._item_cells.pop(item, ()):
+            cell = self._cells[key]
+            cell.remove(item)
+            if not cell:
+                del self._cells[key]
+
+    def query(self, rect):
+        """Items whose cells overlap rect (a superset of actual overlaps)."""
+        found = {}
+        cells = self._cells
+        for key in self._cell_keys(pygame.Rect(rect)):
+            for item in cells.get(key, ()):
+                found[item] = None
+        return list(found)
+
+    def __len__(self):
+        return len(self._item_cells)
+
+
+class Zone:
+    """A named area of the map. kind is "trigger" or "obstacle".
+
+    With a mask, a rect only collides if it covers at least min_overlap
+    set pixels, which keeps stray anti-aliased pixels from counting.
+    """
+
+    def __init__(self, name, rect, kind="trigger", action=None, mask=None, mask_loader=None,
+                 min_overlap=1):
+        self.name = name
+        self.rect = pygame.Rect(rect)
+        self.kind = kind
+        self.action = action
+        self.min_overlap = min_overlap
+        self._mask = mask
+        self._mask_loader = mask_loader
+
+    @property
+    def mask(self):
+        if self._mask is None and self._mask_loader is not None:
+            self._mask = self._mask_loader()
+            self._mask_loader = None
+        return self._mask
+
+    def collides(self, rect):
+        if not self.rect.colliderect(rect):
+            return False
+        mask = self.mask
+        if mask is None:
+            return True
+        area = rect.clip(self.rect)
+        return mask.overlap_area(_filled_mask(area.size), (area.x - self.rect.x, area.y - self.rect.y)) >= self.min_overlap
+
+
+_filled_masks = {}
+
+
+def _filled_mask(size):
+    mask = _filled_masks.get(size)
+    if mask is None:
+        mask = _filled_masks[size] = pygame.mask.Mask(size, fill=True)
+    return mask
+
+
+class ZoneMap:
+    def __init__(self, cell_size=128):
+        self.grid = SpatialHash(cell_size)
+
+    def add(self, zone):
+        self.grid.insert(zone, zone.rect)
+        return zone
+
+    def remove(self, zone):
+        self.grid.remove(zone)
+
+    def zones_at(self, rect, kind=None):
+        rect = pygame.Rect(rect)
+        return [zone for zone in self.grid.query(rect)
+                if (kind is None or zone.kind == kind) and zone.collides(rect)]
+
+    def blocked(self, rect):
+        return bool(self.zones_at(rect, "obstacle"))
+
+
+def color_mask_zones(tile_map, name, color, threshold, kind="obstacle", min_overlap=1, read=None):
+    """One lazily-masked zone per map tile covering pixels near color.
+
+    read(col, row) gives a tile's pixels; tile_map.tile by default. Pass
+    tile_map.read_tile to use the zones off the main thread.
+    """
+    read = read or tile_map.tile
+    zones = []
+    ts = tile_map.tile_size
+    for row in range(tile_map.rows):
+        for col in range(tile_map.cols):
+            w = min(ts, tile_map.world_size[0] - col * ts)
+            h = min(ts, tile_map.world_size[1] - row * ts)
+
+            def load(col=col, row=row):
+                return pygame.mask.from_threshold(read(col, row), color, threshold)
+
+            zones.append(Zone(f"{name}:{col},{row}", (col * ts, row * ts, w, h), kind, mask_loader=load,
+                              min_overlap=min_overlap))
+    return zones
@@ -0,0 +1,58 @@
+"""Bounded history for scrolling charts.
+
+RingBuffer keeps the latest capacity samples of one series in a
+preallocated array('d'). An append overwrites the oldest sample, so
+memory stays the same however long a session runs.
+
+envelope() downsamples the history to a chart's pixel columns. Each
+column gets the min and max of the samples that fall in it, so spikes
+still show at any zoom. A chart draws a single zig-zag line through
+each column's max and min. The window always spans capacity samples:
+the line grows from the left edge until the buffer is full and then
+scrolls. The work per call depends on the capacity and the width, not
+on how many samples were ever appended.
+"""
+
+from array import array
+
+
+class RingBuffer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = array("d", bytes(8 * capacity))
+        self.count = 0
+        self._next = 0  # slot the next sample goes to
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        self.data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    @property
+    def last(self):
+        return self.data[self._next - 1] if self.count else None
+
+    def values(self):
+        """The held samples, oldest first."""
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return self.data[self._next:] + self.data[:self._next]
+
+    def envelope(self, columns):
+        """(lo, hi) per column of a capacity-wide window, for the columns with samples."""
+        samples = self.values()
+        columns = min(columns, self.capacity)
+        out = []
+        start = 0
+        for i in range(columns):
+            end = min((i + 1) * self.capacity // columns, self.count)
+            if end <= start:
+                break
+            chunk = samples[start:end]
+            out.append((min(chunk), max(chunk)))
+            start = end
+        return out
@@ -0,0 +1,106 @@
+"""Frame timing helpers for the homepage loop and the mini-games.
+
+FixedTimestep turns variable real frame times into a whole number of
+fixed simulation steps, so movement speed does not depend on how fast
+the machine renders. The leftover fraction (alpha) is used to
+interpolate between the last two simulated positions when drawing.
+
+FramePacer picks the tick rate for the next frame: the full rate while
+something is moving or input just arrived, and a low idle rate on static
+screens so the loop sleeps most of the time.
+
+SimClock drives a simulation (the Fed mini-game's) from a UI timer
+rather than a frame loop. It measures the real time between calls,
+scales it by a speed multiplier and hands out whole fixed steps, so the
+simulation runs at the requested speed however late the timer fires.
+Steps the caller has no time for can be deferred to the next call, up to
+a cap. It can also be paused.
+"""
+
+
+class FixedTimestep:
+    def __init__(self, step=1 / 60, max_steps=5):
+        self.step = step
+        # Cap on steps per frame so a long stall cannot snowball
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, elapsed):
+        """Add elapsed seconds; returns how many fixed steps to simulate now."""
+        self.accumulator += elapsed
+        # The epsilon keeps exact multiples of step from rounding down
+        steps = int(self.accumulator / self.step + 1e-9)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator = max(0.0, self.accumulator - steps * self.step)
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a step not yet simulated, in [0, 1)."""
+        return self.accumulator / self.step
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+class FramePacer:
+    def __init__(self, active_fps=60, idle_fps=20, linger=0.5):
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        # Stay at the active rate this long after the last activity
+        self.linger = linger
+        self._idle_for = 0.0
+
+    def next_fps(self, active, elapsed):
+        if active:
+            self._idle_for = 0.0
+        else:
+            self._idle_for += elapsed
+        return self.active_fps if self._idle_for < self.linger else self.idle_fps
+
+
+class SimClock:
+    def __init__(self, step, speed=1.0, max_backlog=2000):
+        """Fixed simulation steps of step seconds, run at speed x wall-clock time.
+
+        At most max_backlog steps are ever due at once; simulated time
+        beyond that is dropped and counted in self.dropped.
+        """
+        self.timestep = FixedTimestep(step, max_backlog)
+        self.speed = speed
+        self.paused = False
+        self.dropped = 0
+        self._last = None
+
+    def advance(self, now):
+        """now is a perf_counter() reading; returns how many steps are due.
+
+        Steps come from the time measured since the last call, not from
+        when the caller meant to run, so late timer callbacks catch up
+        instead of drifting.
+        """
+        last, self._last = self._last, now
+        if last is None or self.paused:
+            return 0
+        timestep = self.timestep
+        scaled = (now - last) * self.speed
+        due = (timestep.accumulator + scaled) / timestep.step
+        steps = timestep.advance(scaled)
+        if due - steps >= 1:
+            self.dropped += int(due - steps)
+        return steps
+
+    def defer(self, steps):
+        """Hand back steps the caller could not run; they are due again next time."""
+        self.timestep.accumulator += steps * self.timestep.step
+
+    def pause(self):
+        self.paused = True
+        self.timestep.reset()
+
+    def resume(self):
+        self.paused = False
+        self._last = None
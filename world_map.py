@@ -0,0 +1,146 @@
+"""Scrolling world map split into tiles.
+
+The play screen used to squash map.png into the window. TiledMap keeps
+the map at world size instead and shows it through a Camera that follows
+the avatar. The source image is decoded and cut into tile_size squares
+once; the tiles are stored as raw pixels in the asset cache (see
+assets.py) and read back lazily, only when they come near the camera.
+Loaded tiles live in an LRU of at most max_tiles entries, so memory and
+per-frame work depend on the window size, not on how large the map is.
+"""
+
+import os
+from collections import OrderedDict
+
+import pygame
+
+from assets import CACHE_DIR, read_raw, source_hash, write_raw
+
+
+class Camera:
+    """Viewport into the world, in world coordinates."""
+
+    def __init__(self, view_size, world_size):
+        self.rect = pygame.Rect((0, 0), view_size)
+        self.world_rect = pygame.Rect((0, 0), world_size)
+
+    def follow(self, center):
+        self.rect.center = (round(center[0]), round(center[1]))
+        self.rect.clamp_ip(self.world_rect)
+
+    def to_screen(self, pos):
+        return pos[0] - self.rect.x, pos[1] - self.rect.y
+
+
+class TiledMap:
+    def __init__(self, path, world_size, tile_size=256, max_tiles=48, cache_dir=CACHE_DIR):
+        self.path = path
+        self.world_size = (int(world_size[0]), int(world_size[1]))
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.cache_dir = cache_dir
+        self.cols = -(-self.world_size[0] // tile_size)
+        self.rows = -(-self.world_size[1] // tile_size)
+        self.tile_hits = 0
+        self.tile_loads = 0
+        self._tiles = OrderedDict()
+
+        stem = os.path.splitext(os.path.basename(path))[0]
+        w, h = self.world_size
+        self._prefix = f"{stem}-tiles{tile_size}-{w}x{h}-"
+        self.source_digest = source_hash(path)
+        self._slice_if_needed()
+
+    # ---------------------------
+    # Tile files
+    # ---------------------------
+    def _tile_path(self, col, row):
+        return os.path.join(self.cache_dir, f"{self._prefix}{col}_{row}-RGB-{self.source_digest}.raw")
+
+    def _tile_size_at(self, col, row):
+        ts = self.tile_size
+        return (min(ts, self.world_size[0] - col * ts), min(ts, self.world_size[1] - row * ts))
+
+    def _slice_if_needed(self):
+        if all(os.path.exists(self._tile_path(c, r)) for c in range(self.cols) for r in range(self.rows)):
+            return
+        # One-off: decode and scale the whole image, cut it up, let it go
+        world = pygame.transform.scale(pygame.image.load(self.path), self.world_size)
+        ts = self.tile_size
+        for row in range(self.rows):
+            for col in range(self.cols):
+                area = pygame.Rect((col * ts, row * ts), self._tile_size_at(col, row))
+                write_raw(self._tile_path(col, row), world.subsurface(area), "RGB")
+        self._prune_stale()
+
+    def _prune_stale(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(self._prefix) and not name.endswith(f"-{self.source_digest}.raw"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    # ---------------------------
+    # Tile cache
+    # ---------------------------
+    def tile(self, col, row):
+        key = (col, row)
+        surface = self._tiles.get(key)
+        if surface is not None:
+            self.tile_hits += 1
+            self._tiles.move_to_end(key)
+            return surface
+        return self.add_tile(col, row, self.read_tile(col, row))
+
+    def read_tile(self, col, row):
+        """Pixels of a tile, not yet converted; safe off the main thread."""
+        surface = read_raw(self._tile_path(col, row), self._tile_size_at(col, row), "RGB")
+        if surface is None:
+            # Cache entry vanished or is unwritable; rebuild the tiles
+            self._slice_if_needed()
+            surface = read_raw(self._tile_path(col, row), self._tile_size_at(col, row), "RGB")
+            if surface is None:
+                surface = pygame.Surface(self._tile_size_at(col, row))
+        return surface
+
+    def add_tile(self, col, row, surface):
+        """Convert tile pixels from read_tile() and put them in the cache."""
+        surface = surface.convert()
+        self.tile_loads += 1
+        self._tiles[(col, row)] = surface
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return surface
+
+    def tile_range(self, view, margin=0):
+        """Columns and rows of tiles overlapping view (plus margin tiles)."""
+        ts = self.tile_size
+        c0 = max(0, view.left // ts - margin)
+        r0 = max(0, view.top // ts - margin)
+        c1 = min(self.cols - 1, (view.right - 1) // ts + margin)
+        r1 = min(self.rows - 1, (view.bottom - 1) // ts + margin)
+        return range(c0, c1 + 1), range(r0, r1 + 1)
+
+    def prefetch(self, view, margin=1, budget=1):
+        """Load up to budget not-yet-loaded tiles around view."""
+        cols, rows = self.tile_range(view, margin)
+        for row in rows:
+            for col in cols:
+                if budget <= 0:
+                    return
+                if (col, row) not in self._tiles:
+                    self.tile(col, row)
+                    budget -= 1
+
+    def draw(self, surface, camera):
+        """Blit only the tiles visible through camera."""
+        view = camera.rect
+        ts = self.tile_size
+        cols, rows = self.tile_range(view)
+        surface.blits([(self.tile(col, row), (col * ts - view.x, row * ts - view.y))
+                       for row in rows for col in cols], False)